@@ -0,0 +1,136 @@
+"""
+Admin dashboard statistics
+Table existence is re-read on each cache reload, totals come from one summarized query,
+and prediction trends from the hourly rollups (or one aggregation over a bounded
+created_at window before they exist); the result is cached for
+ADMIN_STATS_SETTINGS['ttl_seconds']. Signups, product CRUD and prediction inserts in
+this worker adjust the cached totals so they don't lag until the next refresh.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Set
+
+from cache import TTLCache
+from config import ADMIN_STATS_SETTINGS
+
+COUNTED_TABLES = ('users', 'products', 'predictions')
+
+
+class AdminStatsService:
+    def __init__(self, connect: Callable, settings: Dict = None):
+        self.connect = connect
+        self.settings = dict(ADMIN_STATS_SETTINGS, **(settings or {}))
+        self.cache = TTLCache(ttl=self.settings['ttl_seconds'])
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tables(cursor) -> Set[str]:
+        """Tables in the current schema; read on every reload so migrations applied later are picked up"""
+        cursor.execute("SELECT table_name AS name FROM information_schema.tables WHERE table_schema = DATABASE()")
+        return {row['name'] for row in cursor.fetchall()}
+
+    def stats(self) -> Dict:
+        """Cached {'stats', 'recent_predictions', 'trends', 'generated_at'} for /api/admin/stats"""
+        result = self.cache.get_or_load('stats', self._load)
+        with self._lock:
+            return dict(result, stats=dict(result['stats']))
+
+    def record(self, counter: str, delta: int = 1):
+        """Adjust a cached total after a local write (signup, product CRUD, logged prediction)"""
+        cached = self.cache.peek('stats')  # Not a dashboard read: keep it out of the hit/miss counts
+        if cached is not None:
+            with self._lock:
+                cached['stats'][counter] = max(0, cached['stats'][counter] + delta)
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+    def _load(self) -> Dict:
+        conn = self.connect()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            tables = self.tables(cursor)
+            has_predictions = 'predictions' in tables
+            # All totals in one round trip; missing tables count as 0
+            counts = ', '.join(f"(SELECT COUNT(*) FROM {t}) AS {t}" if t in tables else f"0 AS {t}"
+                               for t in COUNTED_TABLES)
+            cursor.execute(f"SELECT {counts}")
+            totals = {name: int(value) for name, value in cursor.fetchone().items()}
+
+            recent, trends = [], self._empty_trends()
+            if has_predictions:
+                cursor.execute("""
+                    SELECT
+                        id,
+                        user_email,
+                        category,
+                        budget,
+                        platform,
+                        predicted_discount,
+                        predicted_platform,
+                        created_at
+                    FROM predictions
+                    ORDER BY created_at DESC
+                    LIMIT %s
+                """, (self.settings['recent_limit'],))
+                recent = cursor.fetchall()
+                trends = self._trends(cursor, from_rollups='prediction_rollup_hourly' in tables)
+        finally:
+            cursor.close()
+            conn.close()
+
+        print(f"✅ Stats loaded: {totals['users']} users, {totals['products']} products, "
+              f"{totals['predictions']} predictions")
+        return {'stats': totals, 'recent_predictions': recent, 'trends': trends, 'generated_at': time.time()}
+
+    def _empty_trends(self) -> Dict:
+        return {'window_days': self.settings['trend_days'], 'hourly': [], 'daily': [],
+                'by_category': {}, 'by_platform': {}}
+
+    def _trends(self, cursor, from_rollups: bool = False) -> Dict:
+        """
+        Per-hour/day/category/platform prediction counts over the trailing window, from the
+        hourly rollups (prediction_rollups.py) when they exist, else one pass over predictions
+        """
+        if from_rollups:
+            cursor.execute("""
+                SELECT
+                    DATE_FORMAT(bucket_start, '%%Y-%%m-%%d %%H:00') AS hour,
+                    category,
+                    predicted_platform,
+                    prediction_count AS count
+                FROM prediction_rollup_hourly
+                WHERE bucket_start >= NOW() - INTERVAL %s DAY
+            """, (self.settings['trend_days'],))
+        else:
+            cursor.execute("""
+                SELECT
+                    DATE_FORMAT(created_at, '%%Y-%%m-%%d %%H:00') AS hour,
+                    category,
+                    predicted_platform,
+                    COUNT(*) AS count
+                FROM predictions
+                WHERE created_at >= NOW() - INTERVAL %s DAY
+                GROUP BY hour, category, predicted_platform
+            """, (self.settings['trend_days'],))
+
+        hourly, daily = defaultdict(int), defaultdict(int)
+        by_category, by_platform = defaultdict(int), defaultdict(int)
+        for row in cursor.fetchall():
+            count = int(row['count'])
+            hourly[row['hour']] += count
+            daily[row['hour'][:10]] += count
+            by_category[row['category']] += count
+            by_platform[row['predicted_platform']] += count
+
+        recent_hours = sorted(hourly)[-self.settings['trend_hours']:]
+        trends = self._empty_trends()
+        trends.update(
+            hourly=[{'bucket': hour, 'count': hourly[hour]} for hour in recent_hours],
+            daily=[{'bucket': day, 'count': daily[day]} for day in sorted(daily)],
+            by_category=dict(sorted(by_category.items(), key=lambda item: -item[1])),
+            by_platform=dict(sorted(by_platform.items(), key=lambda item: -item[1]))
+        )
+        return trends
+
@@ -2,13 +2,75 @@ import requests
 import json
 from datetime import datetime, timedelta
 import mysql.connector
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import random
 import re
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from config import API_KEYS, RAPIDAPI_ENDPOINTS, DB_CONFIG, USD_TO_INR, API_TIMEOUT_SECONDS, MAX_RETRIES, COMPARISON_SETTINGS
+from db_pool import get_connection
+from http_client import get_session, get_with_deadline, request_timeout, DeadlineExceeded
+from rate_limiter import platform_rate_limiter
+from cache import Aged, LRUCache, FRESH, STALE
+from metrics import register_collector
+from config import SEARCH_CACHE_SETTINGS, PRODUCT_CACHE_WRITE_SETTINGS, PLATFORM_ADAPTER_SETTINGS, SEARCH_BUDGET_SETTINGS
+from single_flight import SingleFlight
+from platform_adapters import get_adapter, enabled_adapters
+from product_stats import platform_stats, platform_stats_from_columns
+from product_record import ProductRecord
+from payload_parser import decode_json, parse_products
+
+# Process-wide first tier in front of the MySQL product_cache table
+search_cache = LRUCache(
+    SEARCH_CACHE_SETTINGS['max_entries'],
+    ttl=SEARCH_CACHE_SETTINGS['ttl_seconds'],
+    stale_ttl=SEARCH_CACHE_SETTINGS['stale_seconds']
+)
+register_collector('search_cache', search_cache.metrics)
+
+# Identical concurrent searches/comparisons in this process share one fetch
+search_flight = SingleFlight('search')
+compare_flight = SingleFlight('compare')
+register_collector('search_flight', search_flight.metrics)
+register_collector('compare_flight', compare_flight.metrics)
+
+# Background writer for product_cache upserts
+_cache_write_executor = ThreadPoolExecutor(
+    max_workers=PRODUCT_CACHE_WRITE_SETTINGS['workers'],
+    thread_name_prefix='product-cache-writer'
+)
+_cache_write_lock = threading.Lock()
+_cache_write_stats = {
+    'pending': 0,
+    'batches_total': 0,
+    'failed_batches_total': 0,
+    'dropped_batches_total': 0,
+    'rows_written_total': 0,
+    'rows_skipped_total': 0
+}
+
+def _cache_write_metrics() -> Dict:
+    with _cache_write_lock:
+        return dict(_cache_write_stats)
+
+register_collector('product_cache_writer', _cache_write_metrics)
+
+# Shared pool for per-platform searches; sized for several comparisons fanning out at once
+_fanout_executor = ThreadPoolExecutor(
+    max_workers=PLATFORM_ADAPTER_SETTINGS['fanout_workers'],
+    thread_name_prefix='platform-search'
+)
+
+# Per-thread fetch flags: used_fallback is set by _get_mock_products so mock fallbacks are
+# never cached; over_budget marks fetches cut short by the request's latency budget;
+# cached_age is how old the product_cache rows served by the fetch were (0 for API results)
+_fetch_state = threading.local()
+
+def search_cache_key(query: str, platform: str, min_price: float = None, max_price: float = None) -> tuple:
+    """search_cache key shared by the sync and async search paths"""
+    return get_adapter(platform).cache_key(query, min_price, max_price)
 
 class MultiPlatformAPIIntegration:
     """Handles real-time product data from multiple e-commerce platforms"""
@@ -17,155 +79,164 @@ class MultiPlatformAPIIntegration:
         self.api_keys = API_KEYS
         self.cache_duration = 6  # hours
         self.usd_to_inr = USD_TO_INR
-        self.last_api_calls = {}  # Track per-platform
-        self.api_call_delay = 1.5  # seconds between calls
+        self.rate_limiter = platform_rate_limiter  # Shared across instances and requests
         self.show_images = COMPARISON_SETTINGS['show_images']
+        self.http = get_session()
     
-    def _rate_limit_delay(self, platform: str):
-        """Implement rate limiting per platform"""
-        if platform in self.last_api_calls:
-            elapsed = (datetime.now() - self.last_api_calls[platform]).total_seconds()
-            if elapsed < self.api_call_delay:
-                time.sleep(self.api_call_delay - elapsed)
-        self.last_api_calls[platform] = datetime.now()
+    def _rate_limit_delay(self, platform: str, max_wait: float = None) -> bool:
+        """Take a token from the shared per-platform bucket; False means the call should be shed"""
+        return self.rate_limiter.acquire(platform, max_wait)
     
-    def search_amazon_products(self, query: str, min_price: float = None, max_price: float = None) -> List[Dict]:
-        """Search products on Amazon"""
-        print(f"\n🔍 Searching Amazon for: {query}")
+    def _rate_limited_backoff(self, platform: str, retry_after: Optional[str]):
+        """Pause all calls to platform after a 429, honouring Retry-After when given"""
+        try:
+            seconds = float(retry_after) if retry_after else None
+        except ValueError:
+            seconds = None
+        self.rate_limiter.backoff(platform, seconds)
+    
+    def search_amazon_products(self, query: str, min_price: float = None, max_price: float = None) -> List[ProductRecord]:
+        """Search products on Amazon (memory cache -> product_cache -> API)"""
+        return self.search_platform('Amazon', query, min_price, max_price)
+    
+    def search_flipkart_products(self, query: str, min_price: float = None, max_price: float = None) -> List[ProductRecord]:
+        """Search products on Flipkart (memory cache -> product_cache -> API)"""
+        return self.search_platform('Flipkart', query, min_price, max_price)
+    
+    def search_platform(self, platform: str, query: str, min_price: float = None,
+                        max_price: float = None, deadline: float = None) -> List[ProductRecord]:
+        """
+        Serve from the in-process LRU; stale entries are returned while a background refresh runs.
+        With a deadline (time.monotonic() value) the fetch gives up in time and the
+        full fetch continues in the background to warm the cache.
+        """
+        key = search_cache_key(query, platform, min_price, max_price)
+        load = self._cache_loader(platform, query, min_price, max_price)
+        
+        products, state = search_cache.get(key)
+        if state == FRESH:
+            print(f"⚡ Using {len(products)} in-memory {platform} products")
+            return list(products)
+        if state == STALE:
+            print(f"⚡ Using {len(products)} stale {platform} products, refreshing in background")
+            search_cache.refresh(key, load)
+            return list(products)
+        
+        # Concurrent misses for the same key share one fetch and one product_cache write
+        def fetch_and_cache():
+            _fetch_state.used_fallback = False
+            _fetch_state.over_budget = False
+            products = self._fetch_platform_products(platform, query, min_price, max_price, deadline)
+            if _fetch_state.over_budget:
+                search_cache.refresh(key, load)
+            elif not _fetch_state.used_fallback:
+                # Rows from product_cache keep their age, so they expire when the DB copy would
+                search_cache.set(key, list(products), age=_fetch_state.cached_age)
+            return products
+        
+        return list(search_flight.do(key, fetch_and_cache))
+    
+    def _cache_loader(self, platform: str, query: str, min_price: float = None, max_price: float = None):
+        """Background-refresh loader: returns None for mock fallbacks so they never replace real data"""
+        def load():
+            _fetch_state.used_fallback = False
+            products = self._fetch_platform_products(platform, query, min_price, max_price)
+            return None if _fetch_state.used_fallback else Aged(products, _fetch_state.cached_age)
+        return load
+    
+    def _fetch_platform_products(self, platform: str, query: str, min_price: float = None,
+                                 max_price: float = None, deadline: float = None) -> List[ProductRecord]:
+        """product_cache -> rate limiter -> platform API, falling back to mock data"""
+        print(f"\n🔍 Searching {platform} for: {query}")
+        _fetch_state.cached_age = 0.0
         
         # Check cache first
-        cached = self._get_cached_products(query, 'Amazon', min_price, max_price)
+        cached, cached_age = self._get_cached_products(query, platform, min_price, max_price)
         if cached and len(cached) >= 5:
-            print(f"💾 Using {len(cached)} cached Amazon products")
+            print(f"💾 Using {len(cached)} cached {platform} products")
+            _fetch_state.cached_age = cached_age
             return cached
         
-        self._rate_limit_delay('Amazon')
+        max_wait = None
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if left < SEARCH_BUDGET_SETTINGS['min_attempt_seconds']:
+                print(f"⏱️ {platform} latency budget spent before the API call, serving fallback results")
+                _fetch_state.over_budget = True
+                return self._serve_fallback(platform, query, min_price, max_price, cached)
+            max_wait = min(self.rate_limiter.max_wait, left - SEARCH_BUDGET_SETTINGS['min_attempt_seconds'])
         
-        headers = {
-            'X-RapidAPI-Key': self.api_keys['amazon_api'],
-            'X-RapidAPI-Host': 'real-time-amazon-data.p.rapidapi.com'
-        }
+        if not self._rate_limit_delay(platform, max_wait):
+            print(f"⏳ {platform} rate limit reached, serving fallback results")
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
         
-        params = {
-            'query': query,
-            'page': '1',
-            'country': 'IN',
-            'sort_by': 'RELEVANCE',
-            'product_condition': 'ALL'
-        }
+        url, headers, params = get_adapter(platform).build_request(query, min_price, max_price)
         
-        if min_price:
-            params['min_price'] = str(int(min_price))
-        if max_price:
-            params['max_price'] = str(int(max_price))
+        # Without a deadline, retries with backoff for 5xx happen inside the shared session's adapter
+        try:
+            if deadline is None:
+                response = self.http.get(url, headers=headers, params=params, timeout=request_timeout())
+            else:
+                response = get_with_deadline(url, deadline, headers=headers, params=params)
+        except DeadlineExceeded as e:
+            print(f"⏱️ {platform}: {e}, serving fallback results")
+            _fetch_state.over_budget = True
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
+        except Exception as e:
+            print(f"❌ {platform} Error: {e}, serving fallback results")
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
         
-        for attempt in range(MAX_RETRIES):
+        data = None
+        if response.status_code == 200:
             try:
-                response = requests.get(
-                    RAPIDAPI_ENDPOINTS['amazon_search'],
-                    headers=headers,
-                    params=params,
-                    timeout=API_TIMEOUT_SECONDS
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    products = self._parse_amazon_response(data, query)
-                    
-                    if products:
-                        print(f"✅ Amazon: {len(products)} products found")
-                        self._cache_api_results(query, products, 'Amazon', min_price, max_price)
-                        return products
-                    else:
-                        print("⚠️ No Amazon products parsed")
-                        return self._get_mock_products(query, min_price or 10000, 'Amazon', count=10)
-                
-                elif response.status_code == 429:
-                    print(f"⚠️ Amazon Rate limit - Attempt {attempt + 1}/{MAX_RETRIES}")
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(5 * (attempt + 1))
-                        continue
-                    return self._get_mock_products(query, min_price or 10000, 'Amazon', count=10)
-                
-                else:
-                    print(f"❌ Amazon API Error {response.status_code}")
-                    return self._get_mock_products(query, min_price or 10000, 'Amazon', count=10)
-                    
-            except Exception as e:
-                print(f"❌ Amazon Error: {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(2)
-                    continue
-                return self._get_mock_products(query, min_price or 10000, 'Amazon', count=10)
+                data = decode_json(response.content)
+            except ValueError as e:
+                print(f"❌ {platform} returned invalid JSON: {e}, serving fallback results")
+                return self._serve_fallback(platform, query, min_price, max_price, cached)
         
-        return self._get_mock_products(query, min_price or 10000, 'Amazon', count=10)
+        return self._handle_response(platform, response.status_code, data, response.headers.get('Retry-After'),
+                                     query, min_price, max_price, cached)
     
-    def search_flipkart_products(self, query: str, min_price: float = None, max_price: float = None) -> List[Dict]:
-        """Search products on Flipkart"""
-        print(f"\n🔍 Searching Flipkart for: {query}")
-        
-        # Check cache first
-        cached = self._get_cached_products(query, 'Flipkart', min_price, max_price)
-        if cached and len(cached) >= 5:
-            print(f"💾 Using {len(cached)} cached Flipkart products")
-            return cached
-        
-        self._rate_limit_delay('Flipkart')
-        
-        headers = {
-            'X-RapidAPI-Key': self.api_keys['flipkart_api'],
-            'X-RapidAPI-Host': 'real-time-flipkart-data2.p.rapidapi.com'
-        }
-        
-        params = {
-            'query': query,
-            'page': '1'
-        }
-        
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.get(
-                    RAPIDAPI_ENDPOINTS['flipkart_search'],
-                    headers=headers,
-                    params=params,
-                    timeout=API_TIMEOUT_SECONDS
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    products = self._parse_flipkart_response(data, query)
-                    
-                    if products:
-                        print(f"✅ Flipkart: {len(products)} products found")
-                        self._cache_api_results(query, products, 'Flipkart', min_price, max_price)
-                        return products
-                    else:
-                        print("⚠️ No Flipkart products parsed, using mock data")
-                        return self._get_mock_products(query, min_price or 10000, 'Flipkart', count=10)
-                
-                elif response.status_code == 429:
-                    print(f"⚠️ Flipkart Rate limit - Attempt {attempt + 1}/{MAX_RETRIES}")
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(5 * (attempt + 1))
-                        continue
-                    return self._get_mock_products(query, min_price or 10000, 'Flipkart', count=10)
-                
-                else:
-                    print(f"⚠️ Flipkart API unavailable ({response.status_code}), using mock data")
-                    return self._get_mock_products(query, min_price or 10000, 'Flipkart', count=10)
-                    
-            except Exception as e:
-                print(f"⚠️ Flipkart Error: {e}, using mock data")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(2)
-                    continue
-                return self._get_mock_products(query, min_price or 10000, 'Flipkart', count=10)
-        
-        return self._get_mock_products(query, min_price or 10000, 'Flipkart', count=10)
+    def _handle_response(self, platform: str, status_code: int, data, retry_after: Optional[str],
+                         query: str, min_price: float = None, max_price: float = None,
+                         cached: List[ProductRecord] = None) -> List[ProductRecord]:
+        """
+        Turn an API status/payload into products, shared by the sync and async paths;
+        anything but a parsed 200 is answered by _serve_fallback (cached rows, else mock data)
+        """
+        if status_code == 200:
+            products = get_adapter(platform).parse(self, data, query)
+            
+            if products:
+                print(f"✅ {platform}: {len(products)} products found")
+                self._cache_api_results(query, products, platform, min_price, max_price)
+                return products
+            print(f"⚠️ No {platform} products parsed, serving fallback results")
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
+        
+        elif status_code == 429:
+            print(f"⚠️ {platform} Rate limit - backing off")
+            self._rate_limited_backoff(platform, retry_after)
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
+        
+        else:
+            print(f"⚠️ {platform} API unavailable ({status_code}), serving fallback results")
+            return self._serve_fallback(platform, query, min_price, max_price, cached)
+    
+    def compare_products(self, query: str, max_price: float = None, budget: float = None) -> Dict:
+        """
+        🎯 MAIN METHOD: Compare products across every enabled platform
+        Concurrent identical comparisons share one in-flight run, bounded by
+        `budget` seconds (SEARCH_BUDGET_SETTINGS['budget_seconds'] by default)
+        """
+        key = (' '.join(query.lower().split()), max_price)
+        result = compare_flight.do(key, lambda: self._compare_products(query, max_price, budget))
+        # Each caller gets its own list so sorting/filtering never races with other waiters
+        return dict(result, products=list(result['products']))
     
-    def compare_products(self, query: str, max_price: float = None) -> Dict:
+    def _compare_products(self, query: str, max_price: float = None, budget: float = None) -> Dict:
         """
-        🎯 MAIN METHOD: Compare products across Amazon & Flipkart
+        Compare products across all enabled platform adapters
         Returns unified comparison results without images
         """
         print(f"\n{'='*70}")
@@ -176,50 +247,108 @@ class MultiPlatformAPIIntegration:
         print(f"Image Display: {'Enabled' if self.show_images else 'Disabled'}")
         print(f"{'='*70}\n")
         
+        for event, _, payload in self.iter_comparison(query, max_price, budget):
+            if event == 'summary':
+                return payload
+    
+    def iter_comparison(self, query: str, max_price: float = None, budget: float = None):
+        """
+        Search all enabled platforms in parallel within `budget` seconds, yielding
+        ('platform', name, products) as each one finishes (products is None if it failed or timed out)
+        and finally ('summary', None, comparison_result) with partial/failed_platforms set.
+        """
         min_price = None
         if max_price:
             min_price = max_price * 0.3  # 30% of max price as minimum
         
-        # Fetch from both platforms in parallel
-        all_products = []
-        
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_amazon = executor.submit(self.search_amazon_products, query, min_price, max_price)
-            future_flipkart = executor.submit(self.search_flipkart_products, query, min_price, max_price)
-            
-            amazon_products = future_amazon.result()
-            flipkart_products = future_flipkart.result()
+        per_platform, failed = {}, []
+        for platform, products in self.fan_out(query, min_price, max_price, budget):
+            if products is None:
+                failed.append(platform)
+            else:
+                per_platform[platform] = products
+            yield 'platform', platform, products
         
-        all_products.extend(amazon_products)
-        all_products.extend(flipkart_products)
+        result = self._summarize_comparison(per_platform, max_price)
+        result['partial'] = bool(failed)
+        result['failed_platforms'] = failed
+        yield 'summary', None, result
+    
+    def fan_out(self, query: str, min_price: float = None, max_price: float = None, budget: float = None):
+        """
+        Generator of (platform, products or None) in completion order; platforms still
+        running when `budget` seconds run out are yielded last with None. Each search gets
+        the same deadline, so it also cuts its own rate-limit wait and retries short.
+        """
+        budget = SEARCH_BUDGET_SETTINGS['budget_seconds'] if budget is None else budget
+        deadline = time.monotonic() + budget
+        futures = {
+            _fanout_executor.submit(self.search_platform, adapter.name, query, min_price, max_price, deadline): adapter.name
+            for adapter in enabled_adapters()
+        }
         
-        # Filter by price if specified
-        if max_price:
-            all_products = [p for p in all_products if p['discounted_price'] <= max_price]
+        try:
+            for future in as_completed(futures, timeout=budget):
+                platform = futures[future]
+                try:
+                    yield platform, future.result()
+                except Exception as e:
+                    print(f"❌ {platform} search failed: {e}")
+                    yield platform, None
+        except FuturesTimeout:
+            late = [platform for future, platform in futures.items() if not future.done()]
+            print(f"⏱️ {', '.join(late)} missed the {budget:.1f}s latency budget, skipping")
+            for platform in late:
+                yield platform, None
+    
+    def _summarize_comparison(self, per_platform: Dict[str, List[ProductRecord]], max_price: float = None) -> Dict:
+        """Merge per-platform results; price filter, best deal, highest discount and platform stats in one pass"""
+        all_products = []
+        best_deal = highest_discount = None
+        columns = ([], [], [], [])  # platform, price, discounted_price, discount_percent
+        for products in per_platform.values():
+            for product in products:
+                # Filter by price if specified
+                price = product.discounted_price
+                if max_price and price > max_price:
+                    continue
+                all_products.append(product)
+                
+                # Strict comparisons keep the first product on ties, like min()/max()
+                if best_deal is None or price < best_deal.discounted_price:
+                    best_deal = product
+                if highest_discount is None or product.discount_percent > highest_discount.discount_percent:
+                    highest_discount = product
+                
+                columns[0].append(product.platform)
+                columns[1].append(product.price)
+                columns[2].append(price)
+                columns[3].append(product.discount_percent)
         
         print(f"\n📊 COMPARISON RESULTS:")
-        print(f"   Amazon Products: {len(amazon_products)}")
-        print(f"   Flipkart Products: {len(flipkart_products)}")
+        for platform, products in per_platform.items():
+            print(f"   {platform} Products: {len(products)}")
         print(f"   Total Products: {len(all_products)}")
         
         # Calculate statistics
         result = {
             'products': all_products,
             'total_count': len(all_products),
-            'amazon_count': len(amazon_products),
-            'flipkart_count': len(flipkart_products),
+            'amazon_count': len(per_platform.get('Amazon', [])),
+            'flipkart_count': len(per_platform.get('Flipkart', [])),
+            'platform_counts': {platform: len(products) for platform, products in per_platform.items()},
             'show_images': self.show_images
         }
         
         if all_products:
             # Best deal (lowest price)
-            result['best_deal'] = min(all_products, key=lambda x: x['discounted_price'])
+            result['best_deal'] = best_deal
             
             # Highest discount product
-            result['highest_discount'] = max(all_products, key=lambda x: x['discount_percent'])
+            result['highest_discount'] = highest_discount
             
             # Platform with most discounts on average
-            platform_stats = self._calculate_platform_stats(all_products)
+            platform_stats = platform_stats_from_columns(*columns)
             result['platform_stats'] = platform_stats
             
             # Best platform overall (highest avg discount)
@@ -231,14 +360,14 @@ class MultiPlatformAPIIntegration:
             else:
                 result['best_platform'] = None
             
-            print(f"\n🏆 BEST DEAL: {result['best_deal']['product_name'][:50]}...")
-            print(f"   Platform: {result['best_deal']['platform']}")
-            print(f"   Price: ₹{result['best_deal']['discounted_price']:,.0f}")
-            print(f"   Discount: {result['best_deal']['discount_percent']:.1f}%")
+            print(f"\n🏆 BEST DEAL: {best_deal.product_name[:50]}...")
+            print(f"   Platform: {best_deal.platform}")
+            print(f"   Price: ₹{best_deal.discounted_price:,.0f}")
+            print(f"   Discount: {best_deal.discount_percent:.1f}%")
             
-            print(f"\n💰 HIGHEST DISCOUNT: {result['highest_discount']['product_name'][:50]}...")
-            print(f"   Platform: {result['highest_discount']['platform']}")
-            print(f"   Discount: {result['highest_discount']['discount_percent']:.1f}%")
+            print(f"\n💰 HIGHEST DISCOUNT: {highest_discount.product_name[:50]}...")
+            print(f"   Platform: {highest_discount.platform}")
+            print(f"   Discount: {highest_discount.discount_percent:.1f}%")
             
             if result['best_platform']:
                 print(f"\n🎯 BEST PLATFORM OVERALL: {result['best_platform']}")
@@ -249,210 +378,37 @@ class MultiPlatformAPIIntegration:
         
         return result
     
-    def _calculate_platform_stats(self, products: List[Dict]) -> Dict:
-        """Calculate comprehensive statistics per platform"""
-        stats = {}
-        
-        platforms = set(p['platform'] for p in products)
-        
-        for platform in platforms:
-            platform_products = [p for p in products if p['platform'] == platform]
-            
-            if platform_products:
-                stats[platform] = {
-                    'product_count': len(platform_products),
-                    'avg_discount': sum(p['discount_percent'] for p in platform_products) / len(platform_products),
-                    'lowest_price': min(p['discounted_price'] for p in platform_products),
-                    'highest_discount': max(p['discount_percent'] for p in platform_products),
-                    'avg_price': sum(p['discounted_price'] for p in platform_products) / len(platform_products),
-                    'total_savings': sum((p['price'] - p['discounted_price']) for p in platform_products)
-                }
-        
-        return stats
+    def _calculate_platform_stats(self, products: List[ProductRecord]) -> Dict:
+        """Calculate comprehensive statistics per platform (see product_stats.py)"""
+        return platform_stats(products)
     
-    def _parse_amazon_response(self, data: dict, query: str) -> List[Dict]:
+    def _parse_amazon_response(self, data: dict, query: str) -> List[ProductRecord]:
         """Parse Amazon API response - optimized for comparison"""
-        products = []
-        
-        product_list = []
-        if isinstance(data, dict):
-            if 'data' in data:
-                if isinstance(data['data'], dict) and 'products' in data['data']:
-                    product_list = data['data']['products']
-                elif isinstance(data['data'], list):
-                    product_list = data['data']
-            elif 'products' in data:
-                product_list = data['products']
-        
-        for item in product_list[:COMPARISON_SETTINGS['max_products_per_platform']]:
-            try:
-                if not isinstance(item, dict):
-                    continue
-                
-                product_name = (
-                    item.get('product_title') or 
-                    item.get('title') or 
-                    item.get('name') or ''
-                ).strip()
-                
-                if len(product_name) < 3:
-                    continue
-                
-                price_str = str(item.get('product_price', '') or item.get('price', '') or '0')
-                price_match = re.search(r'([\d,]+\.?\d*)', price_str)
-                if not price_match:
-                    continue
-                
-                current_price = float(price_match.group(1).replace(',', ''))
-                
-                if '$' in price_str or current_price < 100:
-                    current_price = current_price * self.usd_to_inr
-                
-                if current_price < 10 or current_price > 1000000:
-                    continue
-                
-                original_price_str = str(item.get('product_original_price', '') or '0')
-                original_match = re.search(r'([\d,]+\.?\d*)', original_price_str)
-                
-                if original_match:
-                    original_price = float(original_match.group(1).replace(',', ''))
-                    if '$' in original_price_str:
-                        original_price = original_price * self.usd_to_inr
-                    if original_price <= current_price:
-                        original_price = current_price * 1.20
-                else:
-                    original_price = current_price * 1.20
-                
-                discount_percent = ((original_price - current_price) / original_price) * 100
-                
-                rating_str = str(item.get('product_star_rating', '') or item.get('rating', '') or '4.0')
-                rating_match = re.search(r'([\d.]+)', rating_str)
-                rating = float(rating_match.group(1)) if rating_match else 4.0
-                rating = max(1.0, min(5.0, rating))
-                
-                # Only include image URL if show_images is enabled
-                image_url = ''
-                if self.show_images:
-                    image_url = (
-                        item.get('product_photo') or 
-                        item.get('image') or 
-                        ''
-                    )
-                
-                product_url = (
-                    item.get('product_url') or 
-                    item.get('link') or 
-                    f'https://www.amazon.in/s?k={query.replace(" ", "+")}'
-                )
-                
-                product = {
-                    'platform': 'Amazon',
-                    'product_name': product_name[:200],
-                    'category': query.title(),
-                    'price': round(original_price, 2),
-                    'discounted_price': round(current_price, 2),
-                    'discount_percent': round(discount_percent, 2),
-                    'rating': round(rating, 1),
-                    'stock': random.randint(50, 200),
-                    'product_url': product_url,
-                    'image_url': image_url,
-                    'sku': item.get('asin', f"AMZ{random.randint(1000, 9999)}"),
-                    'savings': round(original_price - current_price, 2)
-                }
-                
-                if (product['discounted_price'] >= 10 and 
-                    product['discount_percent'] >= COMPARISON_SETTINGS['min_discount_threshold'] and 
-                    product['discount_percent'] <= 90):
-                    products.append(product)
-                
-            except Exception as e:
-                continue
-        
-        return products
+        return parse_products('Amazon', data, query, self.show_images, self.usd_to_inr)
     
-    def _parse_flipkart_response(self, data: dict, query: str) -> List[Dict]:
+    def _parse_flipkart_response(self, data: dict, query: str) -> List[ProductRecord]:
         """Parse Flipkart API response - optimized for comparison"""
-        products = []
-        
-        product_list = []
-        if isinstance(data, dict):
-            if 'products' in data:
-                product_list = data['products']
-            elif 'data' in data and isinstance(data['data'], list):
-                product_list = data['data']
-            elif 'results' in data:
-                product_list = data['results']
-        
-        for item in product_list[:COMPARISON_SETTINGS['max_products_per_platform']]:
-            try:
-                if not isinstance(item, dict):
-                    continue
-                
-                product_name = (
-                    item.get('name') or 
-                    item.get('title') or 
-                    item.get('product_name') or ''
-                ).strip()
-                
-                if len(product_name) < 3:
-                    continue
-                
-                current_price = float(item.get('current_price', 0) or item.get('price', 0) or 0)
-                original_price = float(item.get('original_price', 0) or item.get('mrp', 0) or 0)
-                
-                if current_price < 10:
-                    continue
-                
-                if original_price <= current_price:
-                    original_price = current_price * 1.25
-                
-                discount_percent = ((original_price - current_price) / original_price) * 100
-                
-                rating = float(item.get('rating', 4.0) or 4.0)
-                rating = max(1.0, min(5.0, rating))
-                
-                # Only include image URL if show_images is enabled
-                image_url = ''
-                if self.show_images:
-                    image_url = (
-                        item.get('image') or 
-                        item.get('thumbnail') or 
-                        ''
-                    )
-                
-                product_url = (
-                    item.get('link') or 
-                    item.get('url') or 
-                    f'https://www.flipkart.com/search?q={query.replace(" ", "+")}'
-                )
-                
-                product = {
-                    'platform': 'Flipkart',
-                    'product_name': product_name[:200],
-                    'category': query.title(),
-                    'price': round(original_price, 2),
-                    'discounted_price': round(current_price, 2),
-                    'discount_percent': round(discount_percent, 2),
-                    'rating': round(rating, 1),
-                    'stock': random.randint(50, 200),
-                    'product_url': product_url,
-                    'image_url': image_url,
-                    'sku': item.get('id', f"FLP{random.randint(1000, 9999)}"),
-                    'savings': round(original_price - current_price, 2)
-                }
-                
-                if (product['discounted_price'] >= 10 and 
-                    product['discount_percent'] >= COMPARISON_SETTINGS['min_discount_threshold'] and 
-                    product['discount_percent'] <= 90):
-                    products.append(product)
-                
-            except Exception as e:
-                continue
-        
-        return products
+        return parse_products('Flipkart', data, query, self.show_images, self.usd_to_inr)
     
-    def _get_mock_products(self, category: str, budget: float, platform: str, count: int = 10) -> List[Dict]:
+    def _serve_fallback(self, platform: str, query: str, min_price: float = None, max_price: float = None,
+                        cached: List[ProductRecord] = None) -> List[ProductRecord]:
+        """
+        Results for a shed or failed fetch: the partial product_cache hit, else rows up to
+        SEARCH_CACHE_SETTINGS['stale_fallback_hours'] old, else mock data. Flagged as a
+        fallback so none of it is stored in the in-memory cache as fresh.
+        """
+        if not cached:
+            cached, _ = self._get_cached_products(query, platform, min_price, max_price,
+                                                  max_age_hours=SEARCH_CACHE_SETTINGS['stale_fallback_hours'])
+        if cached:
+            print(f"💾 Serving {len(cached)} cached {platform} products instead")
+            _fetch_state.used_fallback = True
+            return cached
+        return self._get_mock_products(query, min_price or 10000, platform, count=10)
+    
+    def _get_mock_products(self, category: str, budget: float, platform: str, count: int = 10) -> List[ProductRecord]:
         """Generate realistic mock products for a specific platform"""
+        _fetch_state.used_fallback = True
         products = []
         
         product_templates = {
@@ -478,29 +434,69 @@ class MultiPlatformAPIIntegration:
             discount = random.uniform(10, 45) if platform == 'Flipkart' else random.uniform(5, 40)
             discounted_price = base_price * (1 - discount/100)
             
-            product = {
-                'platform': platform,
-                'product_name': f"{random.choice(names)} {random.choice(['Pro', 'Plus', 'Max', 'Lite', 'SE', ''])}".strip(),
-                'category': category,
-                'price': round(base_price, 2),
-                'discounted_price': round(discounted_price, 2),
-                'discount_percent': round(discount, 2),
-                'rating': round(random.uniform(3.8, 4.9), 1),
-                'stock': random.randint(20, 300),
-                'product_url': f'https://{platform.lower()}.com/product-{i}',
-                'image_url': '' if not self.show_images else f'https://via.placeholder.com/300x200?text={platform}',
-                'sku': f'{platform[:3].upper()}{1000+i}',
-                'savings': round(base_price - discounted_price, 2)
-            }
+            product = ProductRecord(
+                platform,
+                f"{random.choice(names)} {random.choice(['Pro', 'Plus', 'Max', 'Lite', 'SE', ''])}".strip(),
+                category,
+                round(base_price, 2),
+                round(discounted_price, 2),
+                round(discount, 2),
+                round(random.uniform(3.8, 4.9), 1),
+                random.randint(20, 300),
+                f'https://{platform.lower()}.com/product-{i}',
+                '' if not self.show_images else f'https://via.placeholder.com/300x200?text={platform}',
+                f'{platform[:3].upper()}{1000+i}',
+                round(base_price - discounted_price, 2)
+            )
             products.append(product)
         
         return products
     
-    def _cache_api_results(self, query: str, products: List[Dict], platform: str, 
+    def _cache_api_results(self, query: str, products: List[ProductRecord], platform: str, 
                           min_price: float = None, max_price: float = None):
-        """Cache API results to database"""
+        """Queue a bulk write of API results to product_cache (runs off the request thread)"""
+        with _cache_write_lock:
+            if _cache_write_stats['pending'] >= PRODUCT_CACHE_WRITE_SETTINGS['max_pending']:
+                _cache_write_stats['dropped_batches_total'] += 1
+                print(f"⚠️ Cache writer busy, not caching {len(products)} {platform} products")
+                return None
+            _cache_write_stats['pending'] += 1
+        
+        rows = list(products)  # Snapshot: callers may keep using the list
+        return _cache_write_executor.submit(self._run_cache_write, query, rows, platform)
+    
+    def _run_cache_write(self, query: str, products: List[ProductRecord], platform: str) -> Dict:
         try:
-            conn = mysql.connector.connect(**DB_CONFIG)
+            return self._write_cache_rows(query, products, platform)
+        finally:
+            with _cache_write_lock:
+                _cache_write_stats['pending'] -= 1
+    
+    def _write_cache_rows(self, query: str, products: List[ProductRecord], platform: str) -> Dict:
+        """Upsert one platform's result set in a single transaction; returns written/skipped counts"""
+        rows, skipped = [], 0
+        for product in products:
+            try:
+                rows.append((
+                    product.platform,
+                    product.product_name,
+                    query,
+                    float(product.price),
+                    float(product.discounted_price),
+                    float(product.discount_percent),
+                    float(product.rating),
+                    int(product.stock),
+                    product.image_url or '',
+                    product.product_url or ''
+                ))
+            except (AttributeError, TypeError, ValueError) as e:
+                skipped += 1
+                print(f"⚠️ Skipping malformed {platform} product for cache: {e!r}")
+        
+        report = {'written': 0, 'skipped': skipped}
+        conn = None
+        try:
+            conn = get_connection()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -509,53 +505,59 @@ class MultiPlatformAPIIntegration:
                 AND cached_at < NOW() - INTERVAL 6 HOUR
             """, (query, platform))
             
-            for product in products:
-                try:
-                    cursor.execute("""
-                        INSERT INTO product_cache 
-                        (platform, product_name, category, price, discounted_price, 
-                         discount_percent, rating, stock, image_url, product_url, cached_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                        ON DUPLICATE KEY UPDATE
-                        price = VALUES(price),
-                        discounted_price = VALUES(discounted_price),
-                        discount_percent = VALUES(discount_percent),
-                        cached_at = NOW()
-                    """, (
-                        product['platform'],
-                        product['product_name'],
-                        query,
-                        product['price'],
-                        product['discounted_price'],
-                        product['discount_percent'],
-                        product['rating'],
-                        product['stock'],
-                        product.get('image_url', ''),
-                        product.get('product_url', '')
-                    ))
-                except:
-                    continue
+            if rows:
+                # mysql-connector rewrites this into one multi-row INSERT
+                cursor.executemany("""
+                    INSERT INTO product_cache 
+                    (platform, product_name, category, price, discounted_price, 
+                     discount_percent, rating, stock, image_url, product_url, cached_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                    ON DUPLICATE KEY UPDATE
+                    price = VALUES(price),
+                    discounted_price = VALUES(discounted_price),
+                    discount_percent = VALUES(discount_percent),
+                    cached_at = NOW()
+                """, rows)
             
             conn.commit()
             cursor.close()
-            conn.close()
-            print(f"💾 Cached {len(products)} {platform} products")
+            report['written'] = len(rows)
+            print(f"💾 Cached {len(rows)} {platform} products ({skipped} skipped)")
         except Exception as e:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            report['error'] = str(e)
             print(f"⚠️ Cache error: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+        
+        with _cache_write_lock:
+            _cache_write_stats['batches_total'] += 1
+            _cache_write_stats['rows_written_total'] += report['written']
+            _cache_write_stats['rows_skipped_total'] += skipped
+            if 'error' in report:
+                _cache_write_stats['failed_batches_total'] += 1
+        return report
     
     def _get_cached_products(self, query: str, platform: str, 
-                           min_price: float = None, max_price: float = None) -> List[Dict]: 
-        """Get cached products"""
+                           min_price: float = None, max_price: float = None,
+                           max_age_hours: int = 6) -> Tuple[List[ProductRecord], float]: 
+        """Get cached products and the age in seconds of the oldest one"""
         try:
-            conn = mysql.connector.connect(**DB_CONFIG)
+            conn = get_connection()
             cursor = conn.cursor(dictionary=True)
             
             sql = """
-                SELECT * FROM product_cache
+                SELECT *, TIMESTAMPDIFF(SECOND, cached_at, NOW()) AS cache_age_seconds
+                FROM product_cache
                 WHERE category = %s AND platform = %s
-                AND cached_at > NOW() - INTERVAL 6 HOUR
+                AND cached_at > NOW() - INTERVAL %s HOUR
             """
-            params = [query, platform]
+            params = [query, platform, max_age_hours]
             
             if min_price:
                 sql += " AND price >= %s"
@@ -568,18 +570,28 @@ class MultiPlatformAPIIntegration:
             sql += " LIMIT 30"
             
             cursor.execute(sql, params)
-            products = cursor.fetchall()
+            rows = cursor.fetchall()
             cursor.close()
             conn.close()
             
-            # Remove image_url if images are disabled
-            if not self.show_images:
-                for product in products:
-                    product['image_url'] = ''
-            
-            return products if products else []
+            age = max((float(row['cache_age_seconds'] or 0) for row in rows), default=0.0)
+            # image_url is dropped if images are disabled
+            return [ProductRecord.from_mapping(row, self.show_images) for row in rows], age
         except Exception as e:
-            return []
+            return [], 0.0
+
+
+_shared_integration = None
+_shared_lock = threading.Lock()
+
+def get_shared_integration() -> MultiPlatformAPIIntegration:
+    """Process-wide instance reused by every /api/search request"""
+    global _shared_integration
+    if _shared_integration is None:
+        with _shared_lock:
+            if _shared_integration is None:
+                _shared_integration = MultiPlatformAPIIntegration()
+    return _shared_integration
 
 
 # Backward compatibility
@@ -1,11 +1,29 @@
-from flask import Flask, render_template, request, jsonify, redirect, session
+from flask import Flask, render_template, request, jsonify, redirect, session, Response
 from flask_cors import CORS
 import mysql.connector
-import pickle
+from mysql.connector import errorcode
 import numpy as np
 import os 
+import json
+import heapq
+import csv
+import io
 from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Dict, List, Optional
+from db_pool import get_connection
+from metrics import render_prometheus, register_collector
+from cache import TTLCache
+from config import LOOKUP_CACHE_TTL_SECONDS, PREDICTION_BATCH_MAX, PREDICTION_TABLE_SETTINGS, MODEL_SETTINGS
+from model_registry import model_registry
+from prediction_engine import score_batch
+from prediction_table import PredictionTable
+from write_behind import WriteBehindQueue
+from relevance import filter_relevant
+from product_stats import platform_stats_from_columns
+from config import PREDICTION_LOG_SETTINGS, COMPARISON_SETTINGS, ADMIN_LIST_SETTINGS
+from keyset import decode_cursor, keyset_condition, next_cursor, page_size_param
+from admin_stats import AdminStatsService
+from prediction_rollups import prediction_rollups, read_breakdown, read_series
 
 app = Flask(__name__)
 app.secret_key = 'App_login_data'  
@@ -15,33 +33,72 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['SESSION_COOKIE_SECURE'] = False 
 app.config['PERMANENT_SESSION_LIFETIME'] = 3600
 
-print("\nLoading ML models...") 
-try:
-    with open('label_encoders.pkl', 'rb') as f: 
-        label_encoders = pickle.load(f) 
-        
-    with open('platform_model.pkl', 'rb') as f:
-        platform_model = pickle.load(f)
-        
-    with open('platform_scaler.pkl', 'rb') as f:
-        platform_scaler = pickle.load(f)
-        
-    with open('discount_model.pkl', 'rb') as f:
-        discount_model = pickle.load(f)
-        
-    with open('discount_scaler.pkl', 'rb') as f:
-        discount_scaler = pickle.load(f)
-        
-    with open('model_metadata.pkl', 'rb') as f:
-        model_metadata = pickle.load(f)
+# ML models load lazily through the registry (MODEL_PRELOAD=1 loads them before forking)
+prediction_table = None
+
+def rebuild_prediction_table(bundle):
+    """Registry listener: precompute the prediction grid for each newly loaded model version"""
+    global prediction_table
+    if not PREDICTION_TABLE_SETTINGS['enabled']:
+        return
+    try:
+        print("Precomputing prediction table...")
+        table = PredictionTable(
+            bundle,
+            budget_step=PREDICTION_TABLE_SETTINGS['budget_step'],
+            budget_max=PREDICTION_TABLE_SETTINGS['budget_max'],
+            interpolate=PREDICTION_TABLE_SETTINGS['interpolate']
+        )
+        check = table.verify(bundle, samples=PREDICTION_TABLE_SETTINGS['verify_samples'])
+        if (check['max_discount_error'] <= PREDICTION_TABLE_SETTINGS['max_discount_error'] and
+                check['platform_mismatch_rate'] <= PREDICTION_TABLE_SETTINGS['max_platform_mismatch_rate']):
+            table.model_version = bundle.version
+            prediction_table = table
+            print(f"✅ Prediction table ready ({table.nbytes / 1e6:.1f} MB, {table.build_seconds:.1f}s)")
+        else:
+            print(f"⚠️ Prediction table failed consistency check, using live scoring: {check}")
+    except Exception as e:
+        print(f"⚠️ Could not build prediction table, using live scoring: {e}")
+
+model_registry.add_listener(rebuild_prediction_table)
+if MODEL_SETTINGS['preload']:
+    model_registry.preload()
+
+
+# Prediction rows are logged off the request path and flushed in batches
+prediction_log = WriteBehindQueue(
+    'prediction_log',
+    """
+        INSERT INTO predictions 
+        (user_email, category, budget, platform, predicted_discount, 
+         predicted_platform, discounted_price, savings)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    get_connection,
+    **PREDICTION_LOG_SETTINGS
+)
+register_collector('prediction_log', prediction_log.metrics)
+
+
+def score_predictions(bundle, categories, budgets, platforms) -> List[Dict]:
+    """Answer from the precomputed table where possible, live models otherwise"""
+    results = [None] * len(categories)
+    table = prediction_table
+    if table is not None and table.model_version == bundle.version:
+        for i, (category, budget, platform) in enumerate(zip(categories, budgets, platforms)):
+            results[i] = table.lookup(category, budget, platform)
     
-    models_loaded = True
-    print("✅ ML models loaded successfully!")
-except Exception as e:
-    models_loaded = False
-    model_metadata = None
-    print(f"❌ Error loading ML models: {e}")
-    print("⚠️ Please run model_training.py first to train and save the models.")
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        live = score_batch(
+            bundle,
+            [categories[i] for i in missing],
+            [budgets[i] for i in missing],
+            [platforms[i] for i in missing]
+        )
+        for i, result in zip(missing, live):
+            results[i] = result
+    return results
 
 DB_CONFIG = {
     'host': 'localhost',
@@ -56,15 +113,67 @@ ADMIN_CREDENTIALS = {
 }
 
 def get_db_connection():
+    """Borrow a pooled connection; conn.close() returns it to the pool"""
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        print("✅ Database connected successfully")
-        return conn
+        return get_connection()
     except mysql.connector.Error as err:
         print(f"❌ Database connection failed: {err}")
         raise 
 
 
+# Distinct category/platform lists change only through the admin product routes,
+# which invalidate this worker's copy; the TTL bounds staleness in other workers.
+lookup_cache = TTLCache(ttl=LOOKUP_CACHE_TTL_SECONDS)
+register_collector('lookup_cache', lookup_cache.metrics)
+
+# Dashboard totals/trends; local writes below adjust the cached totals via stats_service.record()
+stats_service = AdminStatsService(get_db_connection)
+register_collector('admin_stats_cache', stats_service.cache.metrics)
+
+@app.route('/api/admin/models')
+def admin_model_status():
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    return jsonify({'success': True, 'models': model_registry.status()})
+
+@app.route('/api/admin/models/reload', methods=['POST'])
+def admin_reload_models():
+    """Hot-swap to a new model version in this worker without restarting"""
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    
+    try:
+        # Always MODEL_SETTINGS['model_dir']: artifacts are unpickled, so the path is never client-controlled
+        bundle = model_registry.reload()
+        print(f"🔄 Swapped to model version {bundle.version}")
+        return jsonify({'success': True, 'models': model_registry.status()})
+    except Exception as e:
+        print(f"❌ Error reloading models: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def get_distinct_values(column: str) -> List[str]:
+    """Cached SELECT DISTINCT for the category/platform dropdowns"""
+    if column not in ('category', 'platform'):
+        raise ValueError(f"Unsupported lookup column: {column}")
+
+    def load():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT {column} FROM products ORDER BY {column}")
+        values = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        conn.close()
+        return values
+
+    return lookup_cache.get_or_load(column, load)
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint (pool, cache and queue counters)"""
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/admin/login')
 def admin_login_page():
     return render_template('admin_login.html')
@@ -102,80 +211,13 @@ def admin_logout():
 
 @app.route('/api/admin/stats')
 def admin_stats():
+    """Totals, recent predictions and prediction trends (cached, see admin_stats.py)"""
     if 'admin_logged_in' not in session:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401 
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        try:
-            cursor.execute("SELECT COUNT(*) as count FROM users")
-            total_users = cursor.fetchone()['count']
-        except Exception as e:
-            print(f"⚠️ Error counting users: {e}")
-            total_users = 0
-        
-        try:
-            cursor.execute("SELECT COUNT(*) as count FROM products")
-            total_products = cursor.fetchone()['count']
-        except Exception as e:
-            print(f"⚠️ Error counting products: {e}")
-            total_products = 0
-        
-        try:
-            cursor.execute("SHOW TABLES LIKE 'predictions'")
-            table_exists = cursor.fetchone()
-            
-            if table_exists:
-                cursor.execute("SELECT COUNT(*) as count FROM predictions")
-                total_predictions = cursor.fetchone()['count']
-            else:
-                print("⚠️ Predictions table doesn't exist yet")
-                total_predictions = 0
-        except Exception as e:
-            print(f"⚠️ Error counting predictions: {e}")
-            total_predictions = 0
-        
-        recent_predictions = []
-        try:
-            cursor.execute("SHOW TABLES LIKE 'predictions'")
-            table_exists = cursor.fetchone()
-            
-            if table_exists:
-                cursor.execute("""
-                    SELECT 
-                        id,
-                        user_email,
-                        category,
-                        budget,
-                        platform,
-                        predicted_discount,
-                        predicted_platform,
-                        created_at
-                    FROM predictions 
-                    ORDER BY created_at DESC 
-                    LIMIT 10
-                """)
-                recent_predictions = cursor.fetchall()
-        except Exception as e:
-            print(f"⚠️ Error fetching recent predictions: {e}")
-            recent_predictions = []
-        
-        cursor.close()
-        conn.close()
-        
-        print(f"✅ Stats loaded: {total_users} users, {total_products} products, {total_predictions} predictions")
-        
-        return jsonify({
-            'success': True,
-            'stats': {
-                'users': total_users,
-                'products': total_products,
-                'predictions': total_predictions
-            },
-            'recent_predictions': recent_predictions
-        })
+        result = stats_service.stats()
+        return jsonify(dict(result, success=True))
         
     except Exception as e:
         print(f"❌ Error in admin stats: {e}")
@@ -184,22 +226,233 @@ def admin_stats():
         return jsonify({
             'success': False, 
             'error': str(e)
-        }, 500)
+        }), 500
+
+@app.route('/api/admin/analytics/platforms')
+def admin_platform_analytics():
+    """Per-platform price/discount statistics with percentiles over the products table"""
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    try:
+        category = request.args.get('category')
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        sql = "SELECT platform, price, discounted_price, discount_percent FROM products"
+        params = []
+        if category:
+            sql += " WHERE category = %s"
+            params.append(category)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+        columns = list(zip(*rows)) if rows else [[], [], [], []]
+        return jsonify({
+            'success': True,
+            'category': category,
+            'product_count': len(rows),
+            'platform_stats': platform_stats_from_columns(*columns)
+        })
+    except Exception as e:
+        print(f"❌ Error in platform analytics: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def rollup_days_param(value, default: int = 30) -> int:
+    days = int(value or default)
+    if days < 1 or days > 3660:
+        raise ValueError('days must be between 1 and 3660')
+    return days
+
+@app.route('/api/admin/analytics/predictions')
+def admin_prediction_series():
+    """Predictions per ?granularity=day|hour over ?days, optionally for one ?category / ?platform (rollups only)"""
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    try:
+        prediction_rollups.ensure_running()
+        granularity = request.args.get('granularity', 'day')
+        days = rollup_days_param(request.args.get('days'), 2 if granularity == 'hour' else 30)
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            series = read_series(cursor, granularity, days, request.args.get('category'), request.args.get('platform'))
+        except mysql.connector.Error as e:
+            if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                raise
+            series = []  # Rollup tables not created yet (first rollup run pending)
+        finally:
+            cursor.close()
+            conn.close()
+
+        return jsonify({
+            'success': True,
+            'granularity': granularity,
+            'days': days,
+            'series': series,
+            'rollup': prediction_rollups.metrics()
+        })
+    except Exception as e:
+        print(f"❌ Error in prediction analytics: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/admin/analytics/predictions/breakdown')
+def admin_prediction_breakdown():
+    """Predictions per ?dimension=category|platform|user over ?days, busiest first (rollups only)"""
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    try:
+        prediction_rollups.ensure_running()
+        dimension = request.args.get('dimension', 'category')
+        days = rollup_days_param(request.args.get('days'))
+        limit = page_size_param(request.args.get('limit'))
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            rows = read_breakdown(cursor, dimension, days, limit)
+        except mysql.connector.Error as e:
+            if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                raise
+            rows = []  # Rollup tables not created yet (first rollup run pending)
+        finally:
+            cursor.close()
+            conn.close()
+
+        return jsonify({
+            'success': True,
+            'dimension': dimension,
+            'days': days,
+            'rows': rows,
+            'rollup': prediction_rollups.metrics()
+        })
+    except Exception as e:
+        print(f"❌ Error in prediction breakdown: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/admin/analytics/rollup', methods=['POST'])
+def admin_run_rollup():
+    """Fold any new predictions into the rollups now instead of waiting for the next interval"""
+    if 'admin_logged_in' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    try:
+        rolled = prediction_rollups.run_once()
+        return jsonify({'success': True, 'rolled_up': rolled, 'rollup': prediction_rollups.metrics()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def like_prefix(text: str) -> str:
+    """LIKE pattern matching values that start with text (wildcards escaped)"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def stream_user_export(where: str, params: List, export_format: str):
+    """Response streaming every matching user with fetchmany batches (constant memory)"""
+    batch_size = ADMIN_LIST_SETTINGS['export_batch_size']
+    columns = ('id', 'name', 'email', 'created_at')
+
+    def generate():
+        conn = get_db_connection()
+        cursor = conn.cursor(buffered=False)  # Rows stream from the server as fetchmany asks
+        try:
+            cursor.execute(f"""
+                SELECT id, name, email, created_at FROM users {where}
+                ORDER BY created_at DESC, id DESC
+            """, params)
+            if export_format == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if export_format == 'csv':
+                    writer.writerows((row[0], row[1], row[2], row[3].isoformat() if row[3] else '') for row in rows)
+                    chunk = buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    chunk = ''.join(json.dumps({
+                        'id': row[0], 'name': row[1], 'email': row[2],
+                        'created_at': row[3].isoformat() if row[3] else None
+                    }) + '\n' for row in rows)
+                yield chunk
+            if export_format == 'csv':
+                yield buffer.getvalue()
+        except Exception as e:
+            print(f"❌ Error exporting users: {e}")
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                # Client disconnected mid-export: discard the unread rows so the
+                # pooled connection isn't handed back holding an open result set
+                try:
+                    conn.consume_results()
+                except Exception as e:
+                    print(f"⚠️ Could not drain user export result set: {e}")
+            finally:
+                conn.close()
+
+    if export_format == 'csv':
+        return Response(generate(), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=users.csv'})
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=users.ndjson'})
 
 @app.route('/api/admin/users')
 def admin_get_users():
+    """
+    Newest users first, one keyset page at a time: ?limit, ?cursor (next_cursor of the
+    previous page), ?q=<email prefix>. ?format=ndjson|csv streams every match instead.
+    """
     if 'admin_logged_in' not in session:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
     
     try:
+        args = request.args
+        conditions, params = [], []
+        if args.get('q'):
+            conditions.append("email LIKE %s")
+            params.append(like_prefix(args['q'].strip().lower()))
+        
+        export_format = args.get('format', 'json').lower()
+        if export_format in ('ndjson', 'csv'):
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            return stream_user_export(where, params, export_format)
+        if export_format != 'json':
+            raise ValueError('format must be json, ndjson or csv')
+        
+        limit = page_size_param(args.get('limit'))
+        if args.get('cursor'):
+            condition, values = keyset_condition('created_at', 'id', True, decode_cursor(args['cursor'], 'created_at'))
+            conditions.append(condition)
+            params.extend(values)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT id, name, email, created_at FROM users ORDER BY created_at DESC")
+        cursor.execute(f"""
+            SELECT id, name, email, created_at FROM users {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """, params + [limit + 1])
         users = cursor.fetchall()
         cursor.close()
         conn.close()
         
-        return jsonify({'success': True, 'users': users})
+        cursor_token = next_cursor(users, limit, 'created_at', 'created_at', 'id')
+        return jsonify({
+            'success': True,
+            'users': users[:limit],
+            'limit': limit,
+            'next_cursor': cursor_token,
+            'has_more': cursor_token is not None
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -213,6 +466,7 @@ def admin_delete_user(user_id):
         cursor = conn.cursor()
         cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
         conn.commit()
+        stats_service.record('users', -cursor.rowcount)
         cursor.close()
         conn.close()
         
@@ -220,16 +474,64 @@ def admin_delete_user(user_id):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# ?sort= -> (column, key in the returned rows); each has an index ending in product_id
+PRODUCT_SORTS = {
+    'id': ('product_id', 'id'),
+    'price': ('price', 'price'),
+    'discount': ('discount_percent', 'discount_percent'),
+    'rating': ('rating', 'rating')
+}
+# Range filters: query parameter -> (column, operator)
+PRODUCT_RANGE_FILTERS = {
+    'min_price': ('price', '>='),
+    'max_price': ('price', '<='),
+    'min_discount': ('discount_percent', '>='),
+    'max_discount': ('discount_percent', '<='),
+    'min_rating': ('rating', '>=')
+}
+
 @app.route('/api/admin/products')
 def admin_get_products():
+    """
+    One keyset page of products: ?limit, ?cursor (next_cursor of the previous page),
+    ?sort=id|price|discount|rating, ?order=desc|asc, filters ?platform, ?category,
+    ?min_price/?max_price, ?min_discount/?max_discount, ?min_rating
+    """
     if 'admin_logged_in' not in session:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
     
     try:
+        args = request.args
+        sort = args.get('sort', 'id')
+        if sort not in PRODUCT_SORTS:
+            raise ValueError(f"sort must be one of {', '.join(PRODUCT_SORTS)}")
+        order = args.get('order', 'desc').lower()
+        if order not in ('asc', 'desc'):
+            raise ValueError('order must be asc or desc')
+        descending = order == 'desc'
+        limit = page_size_param(args.get('limit'))
+        column, sort_key = PRODUCT_SORTS[sort]
+        
+        conditions, params = [], []
+        for name in ('platform', 'category'):
+            if args.get(name):
+                conditions.append(f"{name} = %s")
+                params.append(args[name])
+        for name, (filter_column, op) in PRODUCT_RANGE_FILTERS.items():
+            if args.get(name) not in (None, ''):
+                conditions.append(f"{filter_column} {op} %s")
+                params.append(float(args[name]))
+        if args.get('cursor'):
+            condition, values = keyset_condition(column, 'product_id', descending,
+                                                 decode_cursor(args['cursor'], f'{sort}:{order}'))
+            conditions.append(condition)
+            params.extend(values)
+        
+        direction = 'DESC' if descending else 'ASC'
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT 
                 product_id as id,
                 product_name as name,
@@ -241,20 +543,32 @@ def admin_get_products():
                 rating,
                 stock
             FROM products 
-            ORDER BY product_id DESC
-        """)
+            {where}
+            ORDER BY {column} {direction}, product_id {direction}
+            LIMIT %s
+        """, params + [limit + 1])
         
         products = cursor.fetchall()
         cursor.close()
         conn.close()
         
+        cursor_token = next_cursor(products, limit, f'{sort}:{order}', sort_key, 'id')
+        products = products[:limit]
         print(f"✅ Successfully loaded {len(products)} products")  # Debug log
         
         return jsonify({
             'success': True, 
-            'products': products
+            'products': products,
+            'limit': limit,
+            'sort': sort,
+            'order': order,
+            'next_cursor': cursor_token,
+            'has_more': cursor_token is not None
         })
         
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+        
     except mysql.connector.Error as db_error:
         print(f"❌ Database error: {db_error}")
         return jsonify({
@@ -348,6 +662,7 @@ def admin_update_product(product_id):
         affected_rows = cursor.rowcount
         cursor.close()
         conn.close()
+        lookup_cache.invalidate()
         
         if affected_rows > 0:
             print(f"✅ Updated product ID: {product_id}")
@@ -393,6 +708,8 @@ def admin_delete_product(product_id):
         deleted_rows = cursor.rowcount
         cursor.close()
         conn.close()
+        lookup_cache.invalidate()
+        stats_service.record('products', -deleted_rows)
         
         if deleted_rows > 0:
             print(f"✅ Deleted product ID: {product_id}")
@@ -432,7 +749,7 @@ def admin_add_product():
             data['price'],
             data['discount_percent'],
             data['discounted_price'],
-            data.get('rating', 4.0),
+            4.0 if data.get('rating') is None else data['rating'],  # rating is NOT NULL (migration 6)
             data.get('stock', 100)
         ))
         
@@ -440,6 +757,8 @@ def admin_add_product():
         new_id = cursor.lastrowid
         cursor.close()
         conn.close()
+        lookup_cache.invalidate()
+        stats_service.record('products', 1)
         
         print(f"✅ Added new product ID: {new_id}")
         return jsonify({'success': True, 'product_id': new_id})
@@ -466,7 +785,8 @@ def get_product_cards():
             SELECT id, product_url, image_url, product_name, price, rating, created_at 
             FROM admin_product_cards 
             ORDER BY created_at DESC
-        """)
+            LIMIT %s
+        """, (ADMIN_LIST_SETTINGS['max_page_size'],))
         cards = cursor.fetchall()
         cursor.close()
         conn.close()
@@ -613,17 +933,8 @@ def predict_page():
         return redirect('/login')
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT DISTINCT category FROM products ORDER BY category")
-        categories = [row[0] for row in cursor.fetchall()]
-        
-        cursor.execute("SELECT DISTINCT platform FROM products ORDER BY platform")
-        platforms = [row[0] for row in cursor.fetchall()]
-        
-        cursor.close()
-        conn.close()
+        categories = get_distinct_values('category')
+        platforms = get_distinct_values('platform')
         
         return render_template('predict.html', categories=categories, platforms=platforms)
     except Exception as e:
@@ -655,7 +966,8 @@ def get_public_product_cards():
             SELECT id, product_url, image_url, product_name, price, rating, created_at 
             FROM admin_product_cards 
             ORDER BY created_at DESC
-        """)
+            LIMIT %s
+        """, (ADMIN_LIST_SETTINGS['max_page_size'],))
         cards = cursor.fetchall()
         cursor.close()
         conn.close()
@@ -729,7 +1041,6 @@ def login():
         cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
         user = cursor.fetchone()
         cursor.close()
-        conn.close()
 
         # Verify password: support legacy plaintext and modern hashed passwords
         verified = False
@@ -756,17 +1067,18 @@ def login():
 
             if is_plaintext:
                 try:
-                    conn = get_db_connection()
+                    # Reuse the borrowed connection instead of opening a second one
                     cur = conn.cursor()
                     new_hash = generate_password_hash(password)
                     cur.execute("UPDATE users SET password = %s WHERE id = %s", (new_hash, user['id']))
                     conn.commit()
                     cur.close()
-                    conn.close()
                     print(f"🔒 Migrated plaintext password to hashed for user: {email}")
                 except Exception as e:
                     print(f"Warning: failed to migrate plaintext password for {email}: {e}")
 
+            conn.close()
+
             session.permanent = True
             session['user_email'] = email
             session['logged_in'] = True
@@ -779,6 +1091,7 @@ def login():
                 'user': {'email': email}
             })
         else:
+            conn.close()
             return jsonify({
                 'success': False,
                 'error': 'Invalid email or password'
@@ -824,6 +1137,7 @@ def signup():
             (name, email, hashed)
         )
         conn.commit()
+        stats_service.record('users', 1)
         cursor.close()
         conn.close()
         
@@ -854,7 +1168,8 @@ def predict():
     print("📮 NEW PREDICTION REQUEST")
     print("="*50)
     
-    if not models_loaded:
+    bundle = model_registry.try_get()
+    if bundle is None:
         error_msg = 'Models not loaded. Please run model_training.py first.'
         print(f"❌ {error_msg}")
         return jsonify({
@@ -875,134 +1190,35 @@ def predict():
         if not category:
             raise ValueError("Category is required")
         
-        # Encode category
-        category_encoded = label_encoders['category'].transform([category])[0]
-        
-        # Calculate price range
-        if budget < 1000:
-            price_range = 0
-        elif budget < 5000:
-            price_range = 1
-        elif budget < 15000:
-            price_range = 2
-        elif budget < 30000:
-            price_range = 3
-        else:
-            price_range = 4
-        
-        # Default values
-        rating_preference = 4.0
-        stock_estimate = 200
-        stock_status = 2
-        
-        # Rating category
-        if rating_preference <= 3.5:
-            rating_category = 0
-        elif rating_preference <= 4.0:
-            rating_category = 1
-        elif rating_preference <= 4.5:
-            rating_category = 2
-        else:
-            rating_category = 3
+        result = score_predictions(bundle, [category], [budget], [preferred_platform])[0]
+        best_platform = result['best_platform']
+        platform_confidence = result['platform_confidence']
+        predicted_discount = result['predicted_discount']
+        discounted_price = result['discounted_price']
+        savings = result['savings']
         
-        # Predict best platform if not specified
-        if preferred_platform:
-            platform_encoded = label_encoders['platform'].transform([preferred_platform])[0]
-            best_platform = preferred_platform
-            platform_confidence = 100.0
-        else:
-            discount_estimate = 15
-            discount_effectiveness = 0.15
-            
-            platform_features_vector = np.array([[
-                category_encoded,
-                budget,
-                discount_estimate,
-                rating_preference,
-                stock_estimate,
-                price_range,
-                discount_effectiveness
-            ]])
-            
-            platform_features_scaled = platform_scaler.transform(platform_features_vector)
-            platform_encoded = platform_model.predict(platform_features_scaled)[0]
-            platform_proba = platform_model.predict_proba(platform_features_scaled)[0]
-            
-            best_platform = label_encoders['platform'].inverse_transform([platform_encoded])[0]
-            platform_confidence = float(platform_proba.max() * 100)
-            
+        if not preferred_platform:
             print(f"🎯 Predicted Platform: {best_platform} ({platform_confidence:.1f}% confidence)")
-        
-        # Predict discount percentage
-        stock_estimate = 200
-        
-        discount_features_vector = np.array([[
-            platform_encoded,
-            category_encoded,
-            budget,
-            rating_preference,
-            stock_estimate,
-            price_range,
-            rating_category,
-            stock_status
-        ]])
-        
-        discount_features_scaled = discount_scaler.transform(discount_features_vector)
-        predicted_discount = float(discount_model.predict(discount_features_scaled)[0])
-        
-        predicted_discount = max(0, min(50, predicted_discount))
-        
         print(f"💰 Predicted Discount: {predicted_discount:.1f}%")
         
-        # Calculate discounted price
-        discounted_price = budget * (1 - predicted_discount / 100)
-        savings = budget - discounted_price
-        
-        # Generate recommendations
-        recommendations = generate_recommendations(
-            predicted_discount, best_platform, category, budget
-        )
-        
-        response = {
-            'success': True,
-            'predicted_discount': round(predicted_discount, 1),
-            'best_platform': best_platform,
-            'platform_confidence': round(platform_confidence, 1),
-            'estimated_price': round(budget, 2),
-            'discounted_price': round(discounted_price, 2),
-            'savings': round(savings, 2),
-            'category': category,
-            'recommendations': recommendations,
-            'model_used': model_metadata['discount_model_name'] if model_metadata else 'ML Model'
-        }
+        response = build_prediction_response(bundle, result)
         
         print(f"📤 Response: {response}")
         print("="*50 + "\n")
         
-        # Save prediction to database
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO predictions 
-                (user_email, category, budget, platform, predicted_discount, 
-                 predicted_platform, discounted_price, savings)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                session.get('user_email', 'anonymous'),
-                category,
-                budget,
-                data.get('platform', 'Auto'),
-                predicted_discount,
-                best_platform,
-                discounted_price,
-                savings
-            ))
-            conn.commit()
-            cursor.close()
-            conn.close()
-        except Exception as db_error:
-            print(f"Warning: Could not save prediction: {db_error}")
+        # Queue prediction for the background writer
+        if prediction_log.put((
+            session.get('user_email', 'anonymous'),
+            category,
+            budget,
+            data.get('platform', 'Auto'),
+            predicted_discount,
+            best_platform,
+            discounted_price,
+            savings
+        )):
+            stats_service.record('predictions', 1)
+        prediction_rollups.ensure_running()
         
         return jsonify(response)
         
@@ -1013,6 +1229,109 @@ def predict():
         print("="*50 + "\n")
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Score many (category, budget, platform) requests with one model call per model"""
+    if 'user_email' not in session:
+        return jsonify({
+            'success': False,
+            'error': 'User not authenticated'
+        }), 401
+    
+    bundle = model_registry.try_get()
+    if bundle is None:
+        return jsonify({
+            'success': False,
+            'error': 'Models not loaded. Please run model_training.py first.'
+        }), 500
+    
+    try:
+        data = request.json or {}
+        items = data.get('requests')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'requests must be a non-empty list'}), 400
+        if len(items) > PREDICTION_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'error': f'At most {PREDICTION_BATCH_MAX} requests per batch'
+            }), 400
+        
+        known_categories = set(bundle['label_encoders']['category'].classes_)
+        known_platforms = set(bundle['label_encoders']['platform'].classes_)
+        
+        # Validate per item so one bad row doesn't fail the whole batch
+        results = [None] * len(items)
+        valid_idx, categories, budgets, platforms = [], [], [], []
+        for i, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Each request must be an object")
+                category = item.get('category', 'Electronics')
+                budget = float(item.get('budget', 5000))
+                platform = item.get('platform') or None
+                if category not in known_categories:
+                    raise ValueError(f"Unknown category: {category}")
+                if platform and platform not in known_platforms:
+                    raise ValueError(f"Unknown platform: {platform}")
+            except (TypeError, ValueError) as e:
+                results[i] = {'success': False, 'error': str(e)}
+                continue
+            valid_idx.append(i)
+            categories.append(category)
+            budgets.append(budget)
+            platforms.append(platform)
+        
+        rows = []
+        if valid_idx:
+            scored = score_predictions(bundle, categories, budgets, platforms)
+            user_email = session.get('user_email', 'anonymous')
+            for i, result in zip(valid_idx, scored):
+                results[i] = build_prediction_response(bundle, result)
+                rows.append((
+                    user_email,
+                    result['category'],
+                    result['budget'],
+                    items[i].get('platform', 'Auto'),
+                    result['predicted_discount'],
+                    result['best_platform'],
+                    result['discounted_price'],
+                    result['savings']
+                ))
+        
+        print(f"📦 Batch prediction: {len(valid_idx)}/{len(items)} scored")
+        
+        # Queue all predictions for the background writer
+        stats_service.record('predictions', prediction_log.put_many(rows))
+        prediction_rollups.ensure_running()
+        
+        return jsonify({'success': True, 'count': len(valid_idx), 'results': results})
+        
+    except Exception as e:
+        print(f"❌ Error in batch prediction: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def build_prediction_response(bundle, result: Dict) -> Dict:
+    """Shape a score_batch() result into the /api/predict response body"""
+    recommendations = generate_recommendations(
+        result['predicted_discount'], result['best_platform'], result['category'], result['budget']
+    )
+    
+    return {
+        'success': True,
+        'predicted_discount': round(result['predicted_discount'], 1),
+        'best_platform': result['best_platform'],
+        'platform_confidence': round(result['platform_confidence'], 1),
+        'estimated_price': round(result['budget'], 2),
+        'discounted_price': round(result['discounted_price'], 2),
+        'savings': round(result['savings'], 2),
+        'category': result['category'],
+        'recommendations': recommendations,
+        'model_used': bundle['model_metadata']['discount_model_name'] if bundle.get('model_metadata') else 'ML Model'
+    }
+
 def generate_recommendations(discount, platform, category, budget):
     """Generate shopping recommendations based on predictions"""
     recommendations = [] 
@@ -1041,12 +1360,7 @@ def generate_recommendations(discount, platform, category, budget):
 def get_categories():
     """Get all available categories"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT category FROM products ORDER BY category")
-        categories = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
+        categories = get_distinct_values('category')
         return jsonify({'success': True, 'categories': categories})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -1055,16 +1369,117 @@ def get_categories():
 def get_platforms():
     """Get all available platforms"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT platform FROM products ORDER BY platform")
-        platforms = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
+        platforms = get_distinct_values('platform')
         return jsonify({'success': True, 'platforms': platforms})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+def positive_int_param(value, name: str, default: int) -> int:
+    """Request parameter as an integer >= 1 (default when absent); ValueError with a client-facing message otherwise"""
+    if value is None or value == '':
+        return default
+    try:
+        number = int(str(value).strip())
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ValueError(f'{name} must be a positive integer')
+    return number
+
+def parse_page_params(data):
+    """(page, page_size) from a search request body, capped at COMPARISON_SETTINGS['max_page_size']"""
+    page = positive_int_param(data.get('page'), 'page', 1)
+    page_size = positive_int_param(data.get('page_size'), 'page_size', COMPARISON_SETTINGS['page_size'])
+    return page, min(page_size, COMPARISON_SETTINGS['max_page_size'])
+
+def build_search_response(product_name, sort_by, comparison_result, page=1, page_size=None):
+    """Filter, rank and format one page of a comparison result into the /api/search response body"""
+    page_size = page_size or COMPARISON_SETTINGS['page_size']
+    all_products = comparison_result['products']
+
+    # Relevance filtering (original difflib rule over an index of distinct field texts, see relevance.py)
+    all_products = filter_relevant(all_products, product_name)
+
+    # Top-K selection: only the products up to the end of the requested page are ordered
+    if sort_by == 'discount':
+        sort_key = lambda x: -x.discount_percent
+    else:  # sort by price
+        sort_key = lambda x: x.discounted_price
+    ranked = heapq.nsmallest(page * page_size, all_products, key=sort_key)
+    page_products = ranked[(page - 1) * page_size:]
+
+    # Format products for frontend - NO IMAGES (the only per-product dict built on this path)
+    formatted_products = [product.to_json() for product in page_products]
+
+    # Prepare response
+    response = {
+        'success': True,
+        'products': formatted_products,
+        'total_count': comparison_result['total_count'],
+        'matched_count': len(all_products),
+        'page': page,
+        'page_size': page_size,
+        'total_pages': (len(all_products) + page_size - 1) // page_size,
+        'amazon_count': comparison_result['amazon_count'],
+        'flipkart_count': comparison_result['flipkart_count'],
+        'platform_counts': comparison_result.get('platform_counts', {}),
+        'partial': comparison_result.get('partial', False),
+        'failed_platforms': comparison_result.get('failed_platforms', [])
+    }
+
+    # Add best deal info
+    # Add best deal info with safe defaults
+    if comparison_result.get('best_deal'):
+        best = comparison_result['best_deal']
+        response['best_deal'] = {
+            'name': best.get('product_name', 'Unknown Product'),
+            'mrp': best.get('price', 0),
+            'sale_price': best.get('discounted_price', 0),
+            'discount': best.get('discount_percent', 0),
+            'platform': best.get('platform', 'Unknown'),
+            'image_url': best.get('image_url', 'https://via.placeholder.com/300x200?text=Product'),
+            'product_link': best.get('product_url', '#'),
+            'rating': best.get('rating', 0)
+        }
+    else:
+        # Provide fallback if no best deal found
+        if ranked:
+            first_product = ranked[0]
+            response['best_deal'] = {
+                'name': first_product.get('product_name', 'Product'),
+                'mrp': first_product.get('price', 0),
+                'sale_price': first_product.get('discounted_price', 0),
+                'discount': first_product.get('discount_percent', 0),
+                'platform': first_product.get('platform', 'Platform'),
+                'image_url': first_product.get('image_url', 'https://via.placeholder.com/300x200?text=Product'),
+                'product_link': first_product.get('product_url', '#'),
+                'rating': first_product.get('rating', 0)
+            } 
+
+    # Add highest discount info
+    if comparison_result.get('highest_discount'):
+        highest = comparison_result['highest_discount']
+        response['highest_discount_product'] = {
+            'name': highest['product_name'],
+            'mrp': highest['price'],
+            'sale_price': highest['discounted_price'],
+            'discount': highest['discount_percent'],
+            'platform': highest['platform'],
+            'product_link': highest.get('product_url', '#')
+        }
+
+    # Add platform statistics
+    response['platform_stats'] = comparison_result.get('platform_stats', {})
+    response['best_platform'] = comparison_result.get('best_platform')
+
+    print(f"\n✅ SEARCH COMPLETE")
+    print(f"   Products: {len(formatted_products)} of {len(all_products)} (page {page})")
+    print(f"   Best Deal Platform: {comparison_result.get('best_deal', {}).get('platform', 'N/A')}")
+    print(f"   Overall Best Platform: {comparison_result.get('best_platform', 'N/A')}")
+    print(f"{'='*70}\n")
+
+    return response
+
 # ===== IMPROVED SEARCH ROUTE =====
 # Replace your existing /api/search route with this improved version
 
@@ -1078,12 +1493,16 @@ def search_products():
         }), 401
 
     try:
-        from api_integrations import MultiPlatformAPIIntegration
+        from api_integrations import get_shared_integration
         
         data = request.json
         product_name = data.get('product_name', '').strip()
         max_price = float(data.get('max_price')) if data.get('max_price') else None
         sort_by = data.get('sort_by', 'price')
+        try:
+            page, page_size = parse_page_params(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
         if not product_name:
             return jsonify({
@@ -1100,8 +1519,8 @@ def search_products():
         print(f"Sort By: {sort_by}")
         print(f"{'='*70}\n")
 
-        # Initialize multi-platform API
-        api = MultiPlatformAPIIntegration()
+        # Shared multi-platform API (keeps HTTP connections warm across requests)
+        api = get_shared_integration()
 
         # Compare products across platforms
         comparison_result = api.compare_products(
@@ -1109,145 +1528,114 @@ def search_products():
             max_price=max_price
         )
 
-        all_products = comparison_result['products']
+        response = build_search_response(product_name, sort_by, comparison_result, page, page_size)
+        return jsonify(response)
 
-        # Enhanced product filtering with fuzzy matching
-        if all_products:
-            try:
-                tokens = [t.lower() for t in product_name.split() if len(t) >= 2]
-            except Exception:
-                tokens = []
-
-            STOPWORDS = {'laptop', 'laptops', 'notebook', 'pc', 'computer', 'computers', 
-                        'mobile', 'phone', 'device', 'watch', 'watches', 'shoe', 'shoes',
-                        'headphone', 'headphones', 'earphone', 'earphones'}
-            tokens = [t for t in tokens if t not in STOPWORDS]
-
-            if tokens:
-                import math
-                import difflib
-
-                def token_matches_in_text(tok: str, text: str) -> bool:
-                    if not tok or not text:
-                        return False
-                    if tok in text:
-                        return True
-                    ratio = difflib.SequenceMatcher(None, tok, text).ratio()
-                    return ratio >= 0.72
-
-                def score_product(product: dict) -> int:
-                    name = (product.get('product_name') or '').lower()
-                    platform = (product.get('platform') or '').lower()
-                    category = (product.get('category') or '').lower()
-                    match_count = 0
-                    for tok in tokens:
-                        if token_matches_in_text(tok, name):
-                            match_count += 2  # Name matches count double
-                        elif token_matches_in_text(tok, platform):
-                            match_count += 1
-                        elif token_matches_in_text(tok, category):
-                            match_count += 1
-                    return match_count
-
-                min_required = max(1, math.ceil(len(tokens) * 0.4))
-                scored = [(p, score_product(p)) for p in all_products]
-                filtered = [p for p, s in scored if s >= min_required]
-
-                if filtered:
-                    print(f"🔎 Filtered to {len(filtered)}/{len(all_products)} relevant products")
-                    all_products = filtered
+    except Exception as e:
+        print(f"❌ Error in product search: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/search/stream', methods=['POST'])
+def search_products_stream():
+    """
+    Streaming /api/search: one event per platform as soon as it answers, then the full
+    response as a 'summary' event. NDJSON by default; Server-Sent Events with
+    "format": "sse" or Accept: text/event-stream.
+    """
+    if 'user_email' not in session:
+        return jsonify({
+            'success': False,
+            'error': 'User not authenticated'
+        }), 401
+
+    try:
+        from api_integrations import get_shared_integration
+
+        data = request.json
+        product_name = data.get('product_name', '').strip()
+        max_price = float(data.get('max_price')) if data.get('max_price') else None
+        sort_by = data.get('sort_by', 'price')
+        try:
+            page, page_size = parse_page_params(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        use_sse = data.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+
+        if not product_name:
+            return jsonify({
+                'success': False,
+                'error': 'Product name is required'
+            }), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    api = get_shared_integration()
+
+    def encode(item):
+        if use_sse:
+            return f"event: {item['event']}\ndata: {json.dumps(item)}\n\n"
+        return json.dumps(item) + '\n'
+
+    def generate():
+        try:
+            for event, platform, payload in api.iter_comparison(product_name, max_price):
+                if event == 'platform':
+                    products = [p for p in payload or [] if not max_price or p.discounted_price <= max_price]
+                    yield encode({
+                        'event': 'platform',
+                        'platform': platform,
+                        'success': payload is not None,
+                        'products': [p.to_json() for p in products]
+                    })
                 else:
-                    softer = [p for p, s in scored if s >= 1]
-                    if softer:
-                        print(f"🔎 Using softer match: {len(softer)} products")
-                        all_products = softer
-
-        # Sort products
-        if sort_by == 'discount':
-            all_products.sort(key=lambda x: x['discount_percent'], reverse=True)
-        else:  # sort by price
-            all_products.sort(key=lambda x: x['discounted_price'])
-
-        # Format products for frontend - NO IMAGES
-        formatted_products = []
-        for product in all_products:
-            formatted_products.append({
-                'name': product['product_name'],
-                'mrp': product['price'],
-                'sale_price': product['discounted_price'],
-                'discount': product['discount_percent'],
-                'product_link': product.get('product_url', '#'),
-                'platform': product['platform'],
-                'rating': product['rating'],
-                'savings': product.get('savings', product['price'] - product['discounted_price'])
-            })
+                    response = build_search_response(product_name, sort_by, payload, page, page_size)
+                    yield encode(dict(response, event='summary'))
+        except Exception as e:
+            print(f"❌ Error in streaming product search: {e}")
+            yield encode({'event': 'error', 'success': False, 'error': str(e)})
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/search/async', methods=['POST'])
+async def search_products_async():
+    """Same as /api/search, with platforms queried concurrently on an event loop"""
+    if 'user_email' not in session:
+        return jsonify({
+            'success': False,
+            'error': 'User not authenticated'
+        }), 401
 
-        # Prepare response
-        response = {
-            'success': True,
-            'products': formatted_products,
-            'total_count': comparison_result['total_count'],
-            'amazon_count': comparison_result['amazon_count'],
-            'flipkart_count': comparison_result['flipkart_count']
-        }
+    try:
+        from async_compare import compare_products_async
 
-        # Add best deal info
-        # Add best deal info with safe defaults
-        if comparison_result.get('best_deal'):
-            best = comparison_result['best_deal']
-            response['best_deal'] = {
-                'name': best.get('product_name', 'Unknown Product'),
-                'mrp': best.get('price', 0),
-                'sale_price': best.get('discounted_price', 0),
-                'discount': best.get('discount_percent', 0),
-                'platform': best.get('platform', 'Unknown'),
-                'image_url': best.get('image_url', 'https://via.placeholder.com/300x200?text=Product'),
-                'product_link': best.get('product_url', '#'),
-                'rating': best.get('rating', 0)
-            }
-        else:
-            # Provide fallback if no best deal found
-            if formatted_products:
-                first_product = all_products[0]
-                response['best_deal'] = {
-                    'name': first_product.get('product_name', 'Product'),
-                    'mrp': first_product.get('price', 0),
-                    'sale_price': first_product.get('discounted_price', 0),
-                    'discount': first_product.get('discount_percent', 0),
-                    'platform': first_product.get('platform', 'Platform'),
-                    'image_url': first_product.get('image_url', 'https://via.placeholder.com/300x200?text=Product'),
-                    'product_link': first_product.get('product_url', '#'),
-                    'rating': first_product.get('rating', 0)
-                } 
-
-        # Add highest discount info
-        if comparison_result.get('highest_discount'):
-            highest = comparison_result['highest_discount']
-            response['highest_discount_product'] = {
-                'name': highest['product_name'],
-                'mrp': highest['price'],
-                'sale_price': highest['discounted_price'],
-                'discount': highest['discount_percent'],
-                'platform': highest['platform'],
-                'product_link': highest.get('product_url', '#')
-            }
-
-        # Add platform statistics
-        response['platform_stats'] = comparison_result.get('platform_stats', {})
-        response['best_platform'] = comparison_result.get('best_platform')
-
-        print(f"\n✅ SEARCH COMPLETE")
-        print(f"   Total Products: {len(formatted_products)}")
-        print(f"   Best Deal Platform: {comparison_result.get('best_deal', {}).get('platform', 'N/A')}")
-        print(f"   Overall Best Platform: {comparison_result.get('best_platform', 'N/A')}")
-        print(f"{'='*70}\n")
+        data = request.json
+        product_name = data.get('product_name', '').strip()
+        max_price = float(data.get('max_price')) if data.get('max_price') else None
+        sort_by = data.get('sort_by', 'price')
+        try:
+            page, page_size = parse_page_params(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
+        if not product_name:
+            return jsonify({
+                'success': False,
+                'error': 'Product name is required'
+            }), 400
+
+        comparison_result = await compare_products_async(product_name, max_price)
+
+        response = build_search_response(product_name, sort_by, comparison_result, page, page_size)
         return jsonify(response)
 
     except Exception as e:
-        print(f"❌ Error in product search: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ Error in async product search: {e}")
         return jsonify({'success': False, 'error': str(e)}), 400
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+"""
+asyncio variant of the multi-platform comparison engine
+Platform calls run as coroutines on one event loop instead of one thread per call;
+each platform gets its own timeout and a slow or failing one only drops its own results.
+Uses aiohttp when installed, otherwise the shared requests Session via worker threads.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from api_integrations import get_shared_integration, search_cache, search_cache_key, _fetch_state
+from cache import FRESH, STALE
+from config import ASYNC_SEARCH_SETTINGS, HTTP_CLIENT_SETTINGS, MAX_RETRIES, FIXTURE_API_SETTINGS
+from http_client import request_timeout
+from payload_parser import decode_json
+from platform_adapters import get_adapter, enabled_adapters
+from product_record import ProductRecord
+
+try:
+    import aiohttp
+except ImportError:  # Optional: fall back to requests in worker threads
+    aiohttp = None
+
+
+class AsyncComparisonEngine:
+    """Async compare_products(); use as `async with AsyncComparisonEngine() as engine:`"""
+
+    def __init__(self, api=None, platform_timeout: float = None):
+        self.api = api or get_shared_integration()
+        self.platform_timeout = platform_timeout or ASYNC_SEARCH_SETTINGS['platform_timeout']
+        # The fixture transport lives in the requests Session, so it needs the threaded requests path
+        self.use_aiohttp = (aiohttp is not None and ASYNC_SEARCH_SETTINGS['use_aiohttp'] and
+                            FIXTURE_API_SETTINGS['mode'] != 'transport')
+        self._session = None
+
+    async def __aenter__(self):
+        if self.use_aiohttp:
+            connect, read = request_timeout()
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=None, connect=connect, sock_read=read),
+                connector=aiohttp.TCPConnector(limit=HTTP_CLIENT_SETTINGS['pool_maxsize']),
+                headers={'Accept': 'application/json'}
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _http_get(self, url: str, headers: Dict, params: Dict):
+        """GET with the same retry/backoff policy as the sync Session; returns (status, data, retry_after)"""
+        if self._session is None:
+            return await asyncio.to_thread(self._blocking_get, url, headers, params)
+
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                async with self._session.get(url, headers=headers, params=params) as response:
+                    if response.status in HTTP_CLIENT_SETTINGS['retry_statuses'] and attempt < MAX_RETRIES:
+                        await asyncio.sleep(HTTP_CLIENT_SETTINGS['backoff_factor'] * (2 ** (attempt - 1)))
+                        continue
+                    data = None
+                    if response.status == 200:
+                        data = decode_json(await response.read())
+                    return response.status, data, response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                await asyncio.sleep(HTTP_CLIENT_SETTINGS['backoff_factor'] * (2 ** (attempt - 1)))
+
+    def _blocking_get(self, url: str, headers: Dict, params: Dict):
+        response = self.api.http.get(url, headers=headers, params=params, timeout=request_timeout())
+        data = decode_json(response.content) if response.status_code == 200 else None
+        return response.status_code, data, response.headers.get('Retry-After')
+
+    async def search(self, platform: str, query: str,
+                     min_price: float = None, max_price: float = None) -> List[ProductRecord]:
+        """Async equivalent of search_<platform>_products (memory cache -> product_cache -> API)"""
+        api = self.api
+        key = search_cache_key(query, platform, min_price, max_price)
+
+        products, state = search_cache.get(key)
+        if state == FRESH:
+            print(f"⚡ Using {len(products)} in-memory {platform} products")
+            return list(products)
+        if state == STALE:
+            print(f"⚡ Using {len(products)} stale {platform} products, refreshing in background")
+            search_cache.refresh(key, api._cache_loader(platform, query, min_price, max_price))
+            return list(products)
+
+        print(f"\n🔍 Searching {platform} for: {query} (async)")
+        cached, cached_age = await asyncio.to_thread(api._get_cached_products, query, platform, min_price, max_price)
+        if cached and len(cached) >= 5:
+            print(f"💾 Using {len(cached)} cached {platform} products")
+            search_cache.set(key, list(cached), age=cached_age)
+            return cached
+
+        wait = api.rate_limiter.reserve(platform)
+        if wait is None:
+            print(f"⏳ {platform} rate limit reached, serving fallback results")
+            return await asyncio.to_thread(api._serve_fallback, platform, query, min_price, max_price, cached)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        url, headers, params = get_adapter(platform).build_request(query, min_price, max_price)
+        try:
+            status, data, retry_after = await self._http_get(url, headers, params)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ {platform} Error: {e}, serving fallback results")
+            return await asyncio.to_thread(api._serve_fallback, platform, query, min_price, max_price, cached)
+
+        # Off the event loop: parsing, and the fallback may read product_cache
+        def handle():
+            _fetch_state.used_fallback = False
+            products = api._handle_response(platform, status, data, retry_after, query, min_price, max_price, cached)
+            return products, _fetch_state.used_fallback
+
+        products, used_fallback = await asyncio.to_thread(handle)
+        if not used_fallback:
+            search_cache.set(key, list(products))
+        return products
+
+    async def _search_with_timeout(self, platform: str, query: str, min_price, max_price):
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self.search(platform, query, min_price, max_price),
+                                          timeout=self.platform_timeout)
+        except asyncio.TimeoutError:
+            print(f"⏱️ {platform} timed out after {time.perf_counter() - start:.1f}s, skipping")
+            raise
+
+    async def compare_products(self, query: str, max_price: float = None) -> Dict:
+        """Compare products across platforms; platforms that fail or time out are reported, not fatal"""
+        min_price = max_price * 0.3 if max_price else None
+        platforms = [adapter.name for adapter in enabled_adapters()]
+
+        results = await asyncio.gather(
+            *(self._search_with_timeout(platform, query, min_price, max_price) for platform in platforms),
+            return_exceptions=True
+        )
+
+        per_platform, failed = {}, []
+        for platform, result in zip(platforms, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                failed.append(platform)
+            else:
+                per_platform[platform] = result
+
+        comparison = self.api._summarize_comparison(per_platform, max_price)
+        comparison['partial'] = bool(failed)
+        comparison['failed_platforms'] = failed
+        return comparison
+
+
+async def compare_products_async(query: str, max_price: float = None) -> Dict:
+    """One-shot helper used by the async search route"""
+    async with AsyncComparisonEngine() as engine:
+        return await engine.compare_products(query, max_price)
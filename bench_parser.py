@@ -0,0 +1,253 @@
+"""
+Benchmark: payload_parser vs the previous per-platform parsers on recorded fixture payloads
+Times JSON decoding (json vs orjson when installed) and parsing, and checks both
+parsers keep the same products. Usage: python bench_parser.py [repeats]
+"""
+import json
+import random
+import re
+import sys
+import time
+from typing import List
+
+from config import COMPARISON_SETTINGS, USD_TO_INR
+from payload_parser import decode_json, orjson, parse_products
+from product_record import ProductRecord
+
+FIXTURES = {'Amazon': 'fixtures/amazon_search.json', 'Flipkart': 'fixtures/flipkart_search.json'}
+QUERY = 'wireless headphones'
+
+
+class LegacyParser:
+    """The parsers previously on MultiPlatformAPIIntegration, unchanged"""
+
+    show_images = False
+    usd_to_inr = USD_TO_INR
+
+    def _parse_amazon_response(self, data: dict, query: str) -> List[ProductRecord]:
+        """Parse Amazon API response - optimized for comparison"""
+        products = []
+
+        product_list = []
+        if isinstance(data, dict):
+            if 'data' in data:
+                if isinstance(data['data'], dict) and 'products' in data['data']:
+                    product_list = data['data']['products']
+                elif isinstance(data['data'], list):
+                    product_list = data['data']
+            elif 'products' in data:
+                product_list = data['products']
+
+        for item in product_list[:COMPARISON_SETTINGS['max_products_per_platform']]:
+            try:
+                if not isinstance(item, dict):
+                    continue
+        
+                product_name = (
+                    item.get('product_title') or 
+                    item.get('title') or 
+                    item.get('name') or ''
+                ).strip()
+        
+                if len(product_name) < 3:
+                    continue
+        
+                price_str = str(item.get('product_price', '') or item.get('price', '') or '0')
+                price_match = re.search(r'([\d,]+\.?\d*)', price_str)
+                if not price_match:
+                    continue
+        
+                current_price = float(price_match.group(1).replace(',', ''))
+        
+                if '$' in price_str or current_price < 100:
+                    current_price = current_price * self.usd_to_inr
+        
+                if current_price < 10 or current_price > 1000000:
+                    continue
+        
+                original_price_str = str(item.get('product_original_price', '') or '0')
+                original_match = re.search(r'([\d,]+\.?\d*)', original_price_str)
+        
+                if original_match:
+                    original_price = float(original_match.group(1).replace(',', ''))
+                    if '$' in original_price_str:
+                        original_price = original_price * self.usd_to_inr
+                    if original_price <= current_price:
+                        original_price = current_price * 1.20
+                else:
+                    original_price = current_price * 1.20
+        
+                discount_percent = ((original_price - current_price) / original_price) * 100
+        
+                rating_str = str(item.get('product_star_rating', '') or item.get('rating', '') or '4.0')
+                rating_match = re.search(r'([\d.]+)', rating_str)
+                rating = float(rating_match.group(1)) if rating_match else 4.0
+                rating = max(1.0, min(5.0, rating))
+        
+                # Only include image URL if show_images is enabled
+                image_url = ''
+                if self.show_images:
+                    image_url = (
+                        item.get('product_photo') or 
+                        item.get('image') or 
+                        ''
+                    )
+        
+                product_url = (
+                    item.get('product_url') or 
+                    item.get('link') or 
+                    f'https://www.amazon.in/s?k={query.replace(" ", "+")}'
+                )
+        
+                product = ProductRecord(
+                    'Amazon',
+                    product_name[:200],
+                    query.title(),
+                    round(original_price, 2),
+                    round(current_price, 2),
+                    round(discount_percent, 2),
+                    round(rating, 1),
+                    random.randint(50, 200),
+                    product_url,
+                    image_url,
+                    item.get('asin', f"AMZ{random.randint(1000, 9999)}"),
+                    round(original_price - current_price, 2)
+                )
+        
+                if (product.discounted_price >= 10 and 
+                    product.discount_percent >= COMPARISON_SETTINGS['min_discount_threshold'] and 
+                    product.discount_percent <= 90):
+                    products.append(product)
+        
+            except Exception as e:
+                continue
+
+        return products
+    
+    def _parse_flipkart_response(self, data: dict, query: str) -> List[ProductRecord]:
+        """Parse Flipkart API response - optimized for comparison"""
+        products = []
+
+        product_list = []
+        if isinstance(data, dict):
+            if 'products' in data:
+                product_list = data['products']
+            elif 'data' in data and isinstance(data['data'], list):
+                product_list = data['data']
+            elif 'results' in data:
+                product_list = data['results']
+
+        for item in product_list[:COMPARISON_SETTINGS['max_products_per_platform']]:
+            try:
+                if not isinstance(item, dict):
+                    continue
+        
+                product_name = (
+                    item.get('name') or 
+                    item.get('title') or 
+                    item.get('product_name') or ''
+                ).strip()
+        
+                if len(product_name) < 3:
+                    continue
+        
+                current_price = float(item.get('current_price', 0) or item.get('price', 0) or 0)
+                original_price = float(item.get('original_price', 0) or item.get('mrp', 0) or 0)
+        
+                if current_price < 10:
+                    continue
+        
+                if original_price <= current_price:
+                    original_price = current_price * 1.25
+        
+                discount_percent = ((original_price - current_price) / original_price) * 100
+        
+                rating = float(item.get('rating', 4.0) or 4.0)
+                rating = max(1.0, min(5.0, rating))
+        
+                # Only include image URL if show_images is enabled
+                image_url = ''
+                if self.show_images:
+                    image_url = (
+                        item.get('image') or 
+                        item.get('thumbnail') or 
+                        ''
+                    )
+        
+                product_url = (
+                    item.get('link') or 
+                    item.get('url') or 
+                    f'https://www.flipkart.com/search?q={query.replace(" ", "+")}'
+                )
+        
+                product = ProductRecord(
+                    'Flipkart',
+                    product_name[:200],
+                    query.title(),
+                    round(original_price, 2),
+                    round(current_price, 2),
+                    round(discount_percent, 2),
+                    round(rating, 1),
+                    random.randint(50, 200),
+                    product_url,
+                    image_url,
+                    item.get('id', f"FLP{random.randint(1000, 9999)}"),
+                    round(original_price - current_price, 2)
+                )
+        
+                if (product.discounted_price >= 10 and 
+                    product.discount_percent >= COMPARISON_SETTINGS['min_discount_threshold'] and 
+                    product.discount_percent <= 90):
+                    products.append(product)
+        
+            except Exception as e:
+                continue
+
+        return products
+
+
+def comparable(products):
+    """Fields both parsers derive from the payload (stock and fallback SKUs are random)"""
+    return [(p.product_name, p.price, p.discounted_price, p.discount_percent, p.rating, p.product_url)
+            for p in products]
+
+
+def best_time(fn, repeats, loops=500):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    legacy = LegacyParser()
+    legacy_parsers = {'Amazon': legacy._parse_amazon_response, 'Flipkart': legacy._parse_flipkart_response}
+
+    print(f"best of {repeats} runs, orjson {'installed' if orjson else 'not installed'}\n")
+    print(f"{'payload':<10}{'json.loads us':>15}{'decode_json us':>16}{'legacy us':>12}{'parser us':>12}"
+          f"{'speedup':>9}{'kept (old/new)':>16}{'same':>6}")
+    for platform, path in FIXTURES.items():
+        with open(path, 'rb') as f:
+            body = f.read()
+        data = json.loads(body)
+
+        old = legacy_parsers[platform](data, QUERY)
+        new = parse_products(platform, data, QUERY, usd_to_inr=USD_TO_INR)
+        # The new parser may keep more (e.g. Flipkart '₹1,099' strings the old float() rejected)
+        new_rows = set(comparable(new))
+        same = all(row in new_rows for row in comparable(old))
+
+        stdlib_s = best_time(lambda: json.loads(body), repeats)
+        decode_s = best_time(lambda: decode_json(body), repeats)
+        old_s = best_time(lambda: legacy_parsers[platform](data, QUERY), repeats)
+        new_s = best_time(lambda: parse_products(platform, data, QUERY, usd_to_inr=USD_TO_INR), repeats)
+        print(f"{platform:<10}{stdlib_s * 1e6:>15.1f}{decode_s * 1e6:>16.1f}{old_s * 1e6:>12.1f}{new_s * 1e6:>12.1f}"
+              f"{old_s / new_s:>8.1f}x{f'{len(old)}/{len(new)}':>16}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: ProductRecord vs the previous 12-key product dicts on a 10k-product result set
+Measures memory (tracemalloc), construction time and throughput of the search
+pipeline (price filter + best deal -> top-K page -> response formatting -> json.dumps).
+Usage: python bench_products.py [product_count] [repeats]
+"""
+import gc
+import heapq
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from product_record import ProductRecord
+
+PAGE_SIZE = 100
+
+
+def raw_rows(count, seed=11):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        price = round(rng.uniform(500, 90000), 2)
+        discount = round(rng.uniform(5, 60), 2)
+        rows.append((rng.choice(['Amazon', 'Flipkart', 'Myntra']), f'Product {i} {rng.random():.6f}',
+                     'Headphones', price, round(price * (1 - discount / 100), 2), discount,
+                     round(rng.uniform(3, 5), 1), rng.randint(20, 300), f'https://example.com/p/{i}', '', f'SKU{i}'))
+    return rows
+
+
+def build_dicts(rows):
+    return [{
+        'platform': r[0], 'product_name': r[1], 'category': r[2], 'price': r[3],
+        'discounted_price': r[4], 'discount_percent': r[5], 'rating': r[6], 'stock': r[7],
+        'product_url': r[8], 'image_url': r[9], 'sku': r[10], 'savings': round(r[3] - r[4], 2)
+    } for r in rows]
+
+
+def build_records(rows):
+    return [ProductRecord(*r) for r in rows]
+
+
+def pipeline_dicts(products, max_price):
+    """Dict products: key lookups and an 8-key response copy per returned product"""
+    kept, best = [], None
+    for p in products:
+        price = p['discounted_price']
+        if price > max_price:
+            continue
+        kept.append(p)
+        if best is None or price < best['discounted_price']:
+            best = p
+    page = heapq.nsmallest(PAGE_SIZE, kept, key=lambda x: x['discounted_price'])
+    formatted = [{
+        'name': p['product_name'], 'mrp': p['price'], 'sale_price': p['discounted_price'],
+        'discount': p['discount_percent'], 'product_link': p.get('product_url', '#'),
+        'platform': p['platform'], 'rating': p['rating'],
+        'savings': p.get('savings', p['price'] - p['discounted_price'])
+    } for p in page]
+    return json.dumps({'products': formatted, 'best': best['product_name']})
+
+
+def pipeline_records(products, max_price):
+    """Same pipeline over ProductRecord attributes"""
+    kept, best = [], None
+    for p in products:
+        price = p.discounted_price
+        if price > max_price:
+            continue
+        kept.append(p)
+        if best is None or price < best.discounted_price:
+            best = p
+    page = heapq.nsmallest(PAGE_SIZE, kept, key=lambda x: x.discounted_price)
+    return json.dumps({'products': [p.to_json() for p in page], 'best': best.product_name})
+
+
+def measure_memory(build, rows):
+    gc.collect()
+    tracemalloc.start()
+    products = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return products, current
+
+
+def best_time(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = raw_rows(count)
+    max_price = 60000
+
+    dicts, dict_bytes = measure_memory(build_dicts, rows)
+    records, record_bytes = measure_memory(build_records, rows)
+
+    build_dict_s = best_time(lambda: build_dicts(rows), repeats)
+    build_record_s = best_time(lambda: build_records(rows), repeats)
+    pipe_dict_s = best_time(lambda: pipeline_dicts(dicts, max_price), repeats)
+    pipe_record_s = best_time(lambda: pipeline_records(records, max_price), repeats)
+
+    print(f"{count} products, best of {repeats} runs\n")
+    print(f"{'':<28}{'dicts':>12}{'records':>12}{'ratio':>8}")
+    print(f"{'memory (KiB)':<28}{dict_bytes / 1024:>12.0f}{record_bytes / 1024:>12.0f}{dict_bytes / record_bytes:>7.1f}x")
+    print(f"{'build (ms)':<28}{build_dict_s * 1000:>12.1f}{build_record_s * 1000:>12.1f}"
+          f"{build_dict_s / build_record_s:>7.1f}x")
+    print(f"{'filter/rank/format/json (ms)':<28}{pipe_dict_s * 1000:>12.1f}{pipe_record_s * 1000:>12.1f}"
+          f"{pipe_dict_s / pipe_record_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
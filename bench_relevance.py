@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: relevance.filter_relevant vs the previous per-product difflib filter
+Also checks that both keep exactly the same products, in the same order (exit status 1 if not).
+Usage: python bench_relevance.py [product_count] [repeats]
+"""
+import contextlib
+import io
+import math
+import difflib
+import random
+import sys
+import time
+
+from relevance import STOPWORDS, filter_relevant, text_matches
+
+BRANDS = ['Sony', 'Boat', 'JBL', 'Dell', 'HP', 'Lenovo', 'ASUS', 'Samsung', 'OnePlus', 'Apple', 'Noise', 'Nike', 'Puma']
+MODELS = ['WH-1000XM4', 'Rockerz 450', 'Tune 510BT', 'Inspiron 15', 'Pavilion x360', 'IdeaPad Slim 3',
+          'VivoBook 15', 'Galaxy S21', 'Nord CE 3', 'iPhone 13', 'ColorFit Pro', 'Air Max 90', 'RS-X']
+SUFFIXES = ['Wireless Bluetooth Headphones with Mic', 'Laptop 16GB RAM 512GB SSD Windows 11',
+            '5G Smartphone 8GB RAM', 'Smart Watch with AMOLED Display', 'Running Shoes for Men', '']
+QUERIES = ['sony headphones', 'sonny wh1000xm4', 'dell inspiron laptop', 'galaxy s21 phone', 'nike air max shoes']
+
+
+def legacy_filter(all_products, product_name):
+    """The difflib filter previously inlined in app.search_products"""
+    tokens = [t.lower() for t in product_name.split() if len(t) >= 2]
+    tokens = [t for t in tokens if t not in STOPWORDS]
+    if not tokens:
+        return all_products
+
+    def token_matches_in_text(tok, text):
+        if not tok or not text:
+            return False
+        if tok in text:
+            return True
+        return difflib.SequenceMatcher(None, tok, text).ratio() >= 0.72
+
+    def score_product(product):
+        name = (product.get('product_name') or '').lower()
+        platform = (product.get('platform') or '').lower()
+        category = (product.get('category') or '').lower()
+        match_count = 0
+        for tok in tokens:
+            if token_matches_in_text(tok, name):
+                match_count += 2
+            elif token_matches_in_text(tok, platform):
+                match_count += 1
+            elif token_matches_in_text(tok, category):
+                match_count += 1
+        return match_count
+
+    min_required = max(1, math.ceil(len(tokens) * 0.4))
+    scored = [(p, score_product(p)) for p in all_products]
+    filtered = [p for p, s in scored if s >= min_required]
+    if filtered:
+        return filtered
+    softer = [p for p, s in scored if s >= 1]
+    return softer or all_products
+
+
+def make_products(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        'product_name': f"{rng.choice(BRANDS)} {rng.choice(MODELS)} {rng.choice(SUFFIXES)}".strip(),
+        'platform': rng.choice(['Amazon', 'Flipkart', 'Myntra']),
+        'category': rng.choice(QUERIES).title()
+    } for _ in range(count)]
+
+
+def timed(fn, products, query, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(products, query)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    products = make_products(count)
+
+    print(f"{count} products, best of {repeats} runs\n")
+    print(f"{'query':<24}{'difflib ms':>12}{'index ms':>12}{'speedup':>10}{'kept (old/new)':>18}{'same':>6}")
+    mismatches = 0
+    for query in QUERIES:
+        text_matches.cache_clear()  # Each query starts with an empty match cache
+        old_time, old = timed(legacy_filter, products, query, repeats)
+        new_time, new = timed(filter_relevant, products, query, repeats)
+        same = old == new
+        mismatches += not same
+        print(f"{query:<24}{old_time * 1000:>12.1f}{new_time * 1000:>12.1f}"
+              f"{old_time / new_time:>9.1f}x{f'{len(old)}/{len(new)}':>18}{'yes' if same else 'NO':>6}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
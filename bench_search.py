@@ -0,0 +1,63 @@
+"""
+Load test: compare_products against the fixture API (no network, deterministic payloads)
+Runs `requests` comparisons from `concurrency` threads with cache-busting queries and
+reports latency percentiles, throughput, partial/fallback rates and fixture outcomes.
+Latency and error injection come from FIXTURE_* environment variables (see config.py).
+Usage: python bench_search.py [requests] [concurrency] [budget_seconds]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('API_FIXTURES', 'transport')
+
+import numpy as np
+
+from api_integrations import get_shared_integration
+from fixture_api import get_responder, serve
+from config import FIXTURE_API_SETTINGS
+from payload_parser import parse_metrics
+from rate_limiter import platform_rate_limiter
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    budget = float(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    if FIXTURE_API_SETTINGS['mode'] == 'server':
+        serve()
+    # Measure our stack, not the RapidAPI quota: lift the local token buckets
+    platform_rate_limiter.default_rate = 1e6
+    platform_rate_limiter.default_burst = 1e6
+    api = get_shared_integration()
+
+    def one(i):
+        start = time.perf_counter()
+        result = api.compare_products(f'wireless headphones {i}', budget=budget)
+        return time.perf_counter() - start, result.get('partial', False), result['total_count']
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([r[0] for r in results]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{total} comparisons, {concurrency} concurrent, mode={FIXTURE_API_SETTINGS['mode']}, "
+          f"latency {FIXTURE_API_SETTINGS['latency_ms']:.0f}±{FIXTURE_API_SETTINGS['jitter_ms']:.0f}ms, "
+          f"429 {FIXTURE_API_SETTINGS['rate_limit_rate']:.0%}, 5xx {FIXTURE_API_SETTINGS['error_rate']:.0%}\n")
+    print(f"throughput      {total / elapsed:.1f} comparisons/s")
+    print(f"latency ms      p50 {p50:.0f}  p95 {p95:.0f}  p99 {p99:.0f}  max {latencies.max():.0f}")
+    print(f"partial         {sum(r[1] for r in results) / total:.1%}")
+    print(f"avg products    {sum(r[2] for r in results) / total:.1f}")
+    print(f"fixture calls   {get_responder().metrics()}")
+    print(f"parser          {parse_metrics()}")
+
+
+if __name__ == '__main__':
+    main()
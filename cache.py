@@ -0,0 +1,183 @@
+"""
+Thread-safe in-process caches
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+class Aged(NamedTuple):
+    """A refresh() result that was already age seconds old when loaded (e.g. read from a DB cache)"""
+    value: Any
+    age: float
+
+
+class TTLCache:
+    """Small key/value cache where every entry expires after ttl seconds"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            return default
+
+    def peek(self, key: Hashable, default=None):
+        """Like get(), but not counted as a hit or miss (for internal bookkeeping reads)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]):
+        """Return the cached value, calling loader() and caching its result on a miss"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self._invalidations += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'hits_total': self._hits,
+                'misses_total': self._misses,
+                'invalidations_total': self._invalidations
+            }
+
+
+class LRUCache:
+    """
+    Size-bounded LRU cache with per-entry TTL and stale-while-revalidate.
+    Entries past ttl but within stale_ttl are still served (as STALE) while
+    refresh() reloads them on a background thread.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, stale_ttl: float = 0, refresh_workers: int = 2):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='cache-refresh')
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def get(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """Return (value, FRESH|STALE), or (None, None) on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None, None
+
+            value, stored_at = entry
+            age = now - stored_at
+            if age > self.ttl + self.stale_ttl:
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None, None
+
+            self._data.move_to_end(key)
+            if age > self.ttl:
+                self._stale_hits += 1
+                return value, STALE
+            self._hits += 1
+            return value, FRESH
+
+    def set(self, key: Hashable, value: Any, age: float = 0.0):
+        """Store value; age (seconds already elapsed since it was produced) shortens its TTL"""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() - max(0.0, age))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any]):
+        """Reload key in the background; loader returning None leaves the entry untouched, Aged(value, age) keeps its age"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                value = loader()
+                if isinstance(value, Aged):
+                    self.set(key, value.value, value.age)
+                elif value is not None:
+                    self.set(key, value)
+                with self._lock:
+                    self._refreshes += 1
+            except Exception as e:
+                with self._lock:
+                    self._refresh_failures += 1
+                print(f"⚠️ Background cache refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+
+    def invalidate(self, key: Hashable = None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'capacity': self.max_entries,
+                'hits_total': self._hits,
+                'stale_hits_total': self._stale_hits,
+                'misses_total': self._misses,
+                'evictions_total': self._evictions,
+                'expirations_total': self._expirations,
+                'refreshes_total': self._refreshes,
+                'refresh_failures_total': self._refresh_failures,
+                'refreshing': len(self._refreshing)
+            }
@@ -1,14 +1,47 @@
+import os
+import tempfile
+
 # API Configuration
 API_KEYS = {
     'amazon_api': '609ebc6c42437df2aa0bc137c9fee442',
-    'flipkart_api': 'bb96fc3b2cmshc717cd4dcdc1e14p162ff0jsn63e6332bdc9d'  
+    'flipkart_api': 'bb96fc3b2cmshc717cd4dcdc1e14p162ff0jsn63e6332bdc9d',
+    'myntra_api': os.getenv('MYNTRA_API_KEY', ''),
+    'ajio_api': os.getenv('AJIO_API_KEY', ''),
+    'meesho_api': os.getenv('MEESHO_API_KEY', '')
 }
 
 RAPIDAPI_ENDPOINTS = {
     'amazon_search': 'https://real-time-amazon-data.p.rapidapi.com/search',
-    'flipkart_search': 'https://flipkart-scraper-api.p.rapidapi.com/product/search'
+    'flipkart_search': 'https://flipkart-scraper-api.p.rapidapi.com/product/search',
+    # Platforms without a default API. An adapter is enabled only when its URL and key are set
+    # AND payload_parser.SCHEMAS has an entry for it (added together with a recorded fixture);
+    # Myntra, AJIO and Meesho have no schema yet, so these settings alone don't enable them
+    'myntra_search': os.getenv('MYNTRA_SEARCH_URL', ''),
+    'ajio_search': os.getenv('AJIO_SEARCH_URL', ''),
+    'meesho_search': os.getenv('MEESHO_SEARCH_URL', '')
+}
+
+# Offline stand-in for the RapidAPI endpoints (fixture_api.py): replays fixtures/<platform>_search.json
+# API_FIXTURES='transport' serves them inside the shared requests Session (no sockets);
+# API_FIXTURES='server' points the endpoints at `python fixture_api.py` (full HTTP stack, aiohttp too)
+FIXTURE_API_SETTINGS = {
+    'mode': os.getenv('API_FIXTURES', ''),  # '', 'transport' or 'server'
+    'fixtures_dir': os.getenv('API_FIXTURES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')),
+    'latency_ms': float(os.getenv('FIXTURE_LATENCY_MS', '150')),
+    'jitter_ms': float(os.getenv('FIXTURE_JITTER_MS', '50')),  # Uniform +/- around latency_ms
+    'rate_limit_rate': float(os.getenv('FIXTURE_429_RATE', '0')),  # Fraction of calls answered with 429
+    'error_rate': float(os.getenv('FIXTURE_ERROR_RATE', '0')),  # Fraction answered with 503
+    'retry_after_seconds': 1,
+    'seed': int(os.getenv('FIXTURE_SEED', '42')),
+    'host': '127.0.0.1',
+    'port': int(os.getenv('FIXTURE_PORT', '8765'))
 }
 
+if FIXTURE_API_SETTINGS['mode'] == 'server':
+    for _key in ('amazon_search', 'flipkart_search', 'myntra_search', 'ajio_search', 'meesho_search'):
+        RAPIDAPI_ENDPOINTS[_key] = (f"http://{FIXTURE_API_SETTINGS['host']}:{FIXTURE_API_SETTINGS['port']}"
+                                    f"/{_key.split('_')[0]}/search")
+
 # Database Configuration
 DB_CONFIG = {
     'host': 'localhost',
@@ -17,18 +50,134 @@ DB_CONFIG = {
     'database': 'project_smart'
 }
 
+# Connection pool (one pool per gunicorn worker process)
+DB_POOL_SETTINGS = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),  # Max open connections per worker
+    'borrow_timeout': 5.0,  # Seconds to wait for a free connection
+    'max_lifetime': 1800,  # Recycle connections older than this (seconds)
+    'health_check_after': 30  # Ping idle connections unused for this long (seconds)
+}
+
 # Constants
 USD_TO_INR = 82.0
 API_TIMEOUT_SECONDS = 30
 MAX_RETRIES = 3
+LOOKUP_CACHE_TTL_SECONDS = 300  # Category/platform dropdown lists
+PREDICTION_BATCH_MAX = 500  # Max requests per /api/predict/batch call
+
+# Precomputed prediction grid (set PREDICTION_TABLE=1 to answer from the grid)
+PREDICTION_TABLE_SETTINGS = {
+    'enabled': os.environ.get('PREDICTION_TABLE', '0') == '1',
+    'budget_step': 50,  # Grid resolution in rupees
+    'budget_max': 200000,  # Larger budgets are scored live
+    'interpolate': True,  # Blend neighbouring grid points within a price range
+    'verify_samples': 500,  # Random inputs checked against the live models at startup
+    'max_discount_error': 2.0,  # Percentage points; above this the table is discarded
+    'max_platform_mismatch_rate': 0.01
+}
+
+# Write-behind logging of /api/predict rows
+PREDICTION_LOG_SETTINGS = {
+    'batch_size': 200,  # Rows per executemany
+    'flush_interval': 1.0,  # Max seconds a row waits before being written
+    'max_queue': 10000,  # Bound on buffered rows per worker
+    'put_timeout': 0.05  # Back-pressure wait before a row is dropped (seconds)
+}
+
+# ML model registry
+MODEL_SETTINGS = {
+    'model_dir': os.environ.get('MODEL_DIR', '.'),  # Directory holding the *.pkl artifacts
+    'preload': os.environ.get('MODEL_PRELOAD', '0') == '1',  # Load at import (gunicorn --preload)
+    'mmap': True,  # Memory-map *.joblib copies of artifacts when present
+    'watch_seconds': int(os.environ.get('MODEL_WATCH_SECONDS', 0)),  # Poll for new model files; 0 = off
+    'retry_seconds': int(os.environ.get('MODEL_RETRY_SECONDS', 30))  # Backoff after a failed load
+}
+
+# Shared HTTP client for platform APIs
+HTTP_CLIENT_SETTINGS = {
+    'pool_connections': 4,  # Distinct hosts kept in the pool
+    'pool_maxsize': 20,  # Keep-alive connections per host
+    'connect_timeout': 5,
+    'read_timeout': API_TIMEOUT_SECONDS,
+    'backoff_factor': 1.0,  # Sleeps 1s, 2s, ... between retries
+    'retry_statuses': [500, 502, 503, 504]  # 429s go to the rate limiter instead of sleeping
+}
+
+# Token-bucket limits for platform API calls
+RATE_LIMIT_SETTINGS = {
+    'rate': 1 / 1.5,  # Tokens per second (one call every 1.5s per platform)
+    'burst': 1,
+    'max_wait': 2.0,  # Longest a request queues for a token before falling back (seconds)
+    'backoff_seconds': 5.0,  # Pause after a 429 when no Retry-After header is sent
+    'platforms': {},  # Per-platform overrides, e.g. {'Amazon': {'rate': 1.0, 'burst': 3}}
+    'backend': os.environ.get('RATE_LIMIT_BACKEND', 'memory'),  # 'file' shares buckets across workers
+    'state_dir': os.path.join(tempfile.gettempdir(), 'smartshop-ratelimit')
+}
+
+# In-process product search cache in front of the product_cache table
+SEARCH_CACHE_SETTINGS = {
+    'max_entries': 1000,  # (query, platform, min_price, max_price) keys per worker
+    'ttl_seconds': 6 * 3600,  # Matches product_cache's 6-hour window
+    'stale_seconds': 1800,  # Serve expired entries this long while refreshing in the background
+    'stale_fallback_hours': 48  # product_cache rows this old still beat mock data when an API call is shed or fails
+}
+
+# Background bulk writes to product_cache
+PRODUCT_CACHE_WRITE_SETTINGS = {
+    'workers': 2,
+    'max_pending': 50  # Result sets waiting to be written; extra ones are not cached
+}
+
+# asyncio comparison engine (/api/search/async)
+ASYNC_SEARCH_SETTINGS = {
+    'platform_timeout': 8.0,  # Seconds per platform before it is reported as failed
+    'use_aiohttp': os.getenv('ASYNC_HTTP_CLIENT', 'aiohttp') == 'aiohttp'  # Else requests via threads
+}
 
 # Platform priority for best deal calculation
 PLATFORM_PRIORITY = ['Amazon', 'Flipkart', 'Myntra', 'AJIO', 'Meesho']
 
+# Platform adapters (platform_adapters.py) and the parallel fan-out in compare_products.
+# SEARCH_PLATFORMS narrows the set; a listed platform still needs a URL, key and payload schema.
+PLATFORM_ADAPTER_SETTINGS = {
+    'enabled': [p.strip() for p in os.getenv('SEARCH_PLATFORMS', ','.join(PLATFORM_PRIORITY)).split(',') if p.strip()],
+    'fanout_workers': 16  # Shared pool for platform calls across concurrent comparisons
+}
+
+# Per-request latency budget for /api/search: cache lookups, API calls and retries all fit inside it
+SEARCH_BUDGET_SETTINGS = {
+    'budget_seconds': float(os.getenv('SEARCH_BUDGET_SECONDS', '2.0')),
+    'min_attempt_seconds': 0.2  # Don't start an HTTP attempt with less time than this left
+}
+
 # Comparison Settings
 COMPARISON_SETTINGS = {
     'show_images': False,  # Disable images in comparison
     'max_products_per_platform': 20,  # Limit results
     'min_discount_threshold': 0,  # Show all discounts
-    'relevance_score_threshold': 0.4  # Minimum relevance match
+    'relevance_score_threshold': 0.4,  # Minimum relevance match
+    'page_size': 100,  # /api/search default page size (covers a full 5-platform result set)
+    'max_page_size': 200
+}
+
+# Admin grid listings (/api/admin/products, /api/admin/users): keyset pages
+ADMIN_LIST_SETTINGS = {
+    'page_size': 50,
+    'max_page_size': 500,
+    'export_batch_size': 1000  # fetchmany batch for the streamed user export
+}
+
+# /api/admin/stats: cached totals, recent predictions and prediction trends
+ADMIN_STATS_SETTINGS = {
+    'ttl_seconds': 30,  # Dashboard polls within this window share one load
+    'recent_limit': 10,
+    'trend_days': 30,  # Trailing window scanned (via created_at) for the trend breakdowns
+    'trend_hours': 48  # Hourly buckets returned
+}
+
+# Incremental predictions rollups (prediction_rollups.py) behind the analytics endpoints
+ROLLUP_SETTINGS = {
+    'interval_seconds': float(os.getenv('ROLLUP_INTERVAL_SECONDS', '60')),  # 0 disables the in-app runner
+    'batch_size': 50000,  # predictions ids folded per transaction
+    'settle_seconds': 5  # Leave rows this young for the next run (in-flight inserts may commit out of id order)
 }
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Process-wide MySQL connection pool
+Shared by every app.py route and MultiPlatformAPIIntegration's product_cache access
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+from config import DB_CONFIG, DB_POOL_SETTINGS
+from metrics import register_collector
+
+
+class _PoolEntry:
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """Wraps a raw connection; close() hands it back to the pool instead of disconnecting"""
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise PoolError("Connection already returned to the pool")
+        return getattr(entry.conn, name)
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.release(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for routes that return early without closing
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded MySQL pool with borrow timeout, health checks and max-lifetime recycling"""
+
+    def __init__(self, db_config: dict, pool_size: int = 10, borrow_timeout: float = 5.0,
+                 max_lifetime: float = 1800, health_check_after: float = 30):
+        self.db_config = dict(db_config)
+        self.pool_size = max(1, pool_size)
+        self.borrow_timeout = borrow_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._waiters = 0
+
+        self._borrows = 0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+
+    def acquire(self) -> PooledConnection:
+        """Borrow a connection, waiting up to borrow_timeout for one to free up"""
+        start = time.monotonic()
+        deadline = start + self.borrow_timeout
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO keeps the warmest connection in use
+                    break
+                if self._open < self.pool_size:
+                    entry = None
+                    self._open += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolError(
+                        f"No database connection available within {self.borrow_timeout}s "
+                        f"(pool size {self.pool_size})"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+            self._in_use += 1
+            waited = time.monotonic() - start
+            self._borrows += 1
+            self._wait_seconds_total += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+        try:
+            entry = self._ensure_usable(entry)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, entry)
+
+    def release(self, entry: _PoolEntry):
+        """Return a connection to the pool, discarding it if it is broken"""
+        discard = False
+        try:
+            if entry.conn.in_transaction:
+                entry.conn.rollback()
+        except Exception:
+            discard = True
+
+        if discard:
+            self._close_quietly(entry.conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._open -= 1
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+
+    def _ensure_usable(self, entry):
+        if entry is None:
+            return self._connect()
+
+        now = time.monotonic()
+        if self.max_lifetime and now - entry.created_at > self.max_lifetime:
+            self._close_quietly(entry.conn)
+            with self._cond:
+                self._recycled += 1
+            return self._connect()
+
+        if now - entry.last_used > self.health_check_after:
+            try:
+                entry.conn.ping(reconnect=False)
+            except Exception:
+                self._close_quietly(entry.conn)
+                with self._cond:
+                    self._health_check_failures += 1
+                return self._connect()
+
+        return entry
+
+    def _connect(self) -> _PoolEntry:
+        conn = mysql.connector.connect(**self.db_config)
+        with self._cond:
+            self._created += 1
+        return _PoolEntry(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                'size': self.pool_size,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'borrows_total': self._borrows,
+                'timeouts_total': self._timeouts,
+                'created_total': self._created,
+                'recycled_total': self._recycled,
+                'health_check_failures_total': self._health_check_failures,
+                'wait_seconds_total': round(self._wait_seconds_total, 6),
+                'wait_seconds_max': round(self._max_wait_seconds, 6)
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return this process's pool, rebuilding it after a fork so workers never share sockets"""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(DB_CONFIG, **DB_POOL_SETTINGS)
+                _pool_pid = pid
+    return _pool
+
+
+def get_connection() -> PooledConnection:
+    return get_pool().acquire()
+
+
+def pool_metrics() -> dict:
+    return get_pool().metrics()
+
+
+register_collector('db_pool', pool_metrics)
@@ -0,0 +1,183 @@
+"""
+Offline stand-in for the RapidAPI search endpoints
+Replays recorded payloads from FIXTURE_API_SETTINGS['fixtures_dir'] (<platform>_search.json)
+with configurable latency, jitter, 429 and 5xx rates from a seeded RNG, so the search
+path can be load-tested and benchmarked without the network. Two ways in:
+  - FixtureTransport: a requests transport adapter mounted on the shared Session
+    (API_FIXTURES=transport, no sockets)
+  - serve(): a local HTTP server the endpoints point at (API_FIXTURES=server)
+    Usage: python fixture_api.py [port]
+"""
+import io
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+from config import FIXTURE_API_SETTINGS, RAPIDAPI_ENDPOINTS
+from metrics import register_collector
+
+
+class FixtureResponder:
+    """Decides status, body and delay for one fixture call"""
+
+    def __init__(self, settings: Dict = None):
+        self.settings = dict(FIXTURE_API_SETTINGS, **(settings or {}))
+        self._rng = random.Random(self.settings['seed'])
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Optional[bytes]] = {}
+        self.stats = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'errors': 0, 'missing_fixture': 0}
+
+    def body(self, name: str) -> Optional[bytes]:
+        """Raw fixture bytes for an endpoint name ('amazon', 'flipkart', ...), read once"""
+        if name not in self._bodies:
+            path = os.path.join(self.settings['fixtures_dir'], f'{name}_search.json')
+            try:
+                with open(path, 'rb') as f:
+                    self._bodies[name] = f.read()
+            except OSError:
+                self._bodies[name] = None
+        return self._bodies[name]
+
+    def respond(self, name: str) -> Tuple[int, Dict[str, str], bytes, float]:
+        """(status, headers, body, delay_seconds); draws from the seeded RNG under a lock"""
+        settings = self.settings
+        with self._lock:
+            roll = self._rng.random()
+            jitter = self._rng.uniform(-settings['jitter_ms'], settings['jitter_ms'])
+            self.stats['requests'] += 1
+        delay = max(0.0, settings['latency_ms'] + jitter) / 1000
+
+        body = self.body(name)
+        if body is None:
+            outcome, status, headers, body = 'missing_fixture', 404, {}, b'{"message": "no fixture"}'
+        elif roll < settings['rate_limit_rate']:
+            outcome, status, body = 'rate_limited', 429, b'{"message": "Too many requests"}'
+            headers = {'Retry-After': str(settings['retry_after_seconds'])}
+        elif roll < settings['rate_limit_rate'] + settings['error_rate']:
+            outcome, status, headers, body = 'errors', 503, {}, b'{"message": "Service unavailable"}'
+        else:
+            outcome, status, headers = 'ok', 200, {}
+        with self._lock:
+            self.stats[outcome] += 1
+        return status, dict(headers, **{'Content-Type': 'application/json'}), body, delay
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+def endpoint_name(url: str) -> str:
+    """Fixture name for a request URL: the RAPIDAPI_ENDPOINTS key prefix, else the first path segment"""
+    for key, endpoint in RAPIDAPI_ENDPOINTS.items():
+        if endpoint and url.startswith(endpoint):
+            return key.split('_')[0]
+    return urlparse(url).path.strip('/').split('/')[0]
+
+
+class FixtureTransport(BaseAdapter):
+    """requests transport adapter answering from a FixtureResponder instead of the network"""
+
+    def __init__(self, responder: FixtureResponder):
+        super().__init__()
+        self.responder = responder
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status, headers, body, delay = self.responder.respond(endpoint_name(request.url))
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout(f"Fixture response slower than {read_timeout}s", request=request)
+        time.sleep(delay)
+
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = raw
+        response.url = request.url
+        response.request = request
+        response.reason = {200: 'OK', 404: 'Not Found', 429: 'Too Many Requests'}.get(status, 'Service Unavailable')
+        response._content = body
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+
+_responder = None
+_responder_lock = threading.Lock()
+
+
+def get_responder() -> FixtureResponder:
+    """Process-wide responder shared by the transport and the server"""
+    global _responder
+    if _responder is None:
+        with _responder_lock:
+            if _responder is None:
+                _responder = FixtureResponder()
+    return _responder
+
+
+def mount_fixture_transport(session: requests.Session):
+    """Route every configured RapidAPI endpoint on `session` to the fixture transport"""
+    transport = FixtureTransport(get_responder())
+    for endpoint in RAPIDAPI_ENDPOINTS.values():
+        if endpoint:
+            session.mount(endpoint, transport)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        status, headers, body, delay = get_responder().respond(endpoint_name(self.path))
+        time.sleep(delay)
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up (deadline/timeout) while we were "slow"
+
+
+def serve(host: str = None, port: int = None) -> ThreadingHTTPServer:
+    """Start the fixture server on a daemon thread and return it (server.shutdown() to stop)"""
+    server = ThreadingHTTPServer((host or FIXTURE_API_SETTINGS['host'],
+                                  FIXTURE_API_SETTINGS['port'] if port is None else port), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+register_collector('fixture_api', lambda: get_responder().metrics() if _responder else {})
+
+
+if __name__ == '__main__':
+    server = serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    host, port = server.server_address[:2]
+    print(f"🧪 Fixture API on http://{host}:{port}/<platform>/search "
+          f"({FIXTURE_API_SETTINGS['latency_ms']:.0f}±{FIXTURE_API_SETTINGS['jitter_ms']:.0f}ms, "
+          f"429 {FIXTURE_API_SETTINGS['rate_limit_rate']:.0%}, 5xx {FIXTURE_API_SETTINGS['error_rate']:.0%})")
+    print("Run the app with API_FIXTURES=server to use it")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,108 @@
+"""
+Shared HTTP client for the RapidAPI platform searches
+One keep-alive Session per worker process, with pooled connections and retry/backoff
+"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HTTP_CLIENT_SETTINGS, MAX_RETRIES, SEARCH_BUDGET_SETTINGS, FIXTURE_API_SETTINGS
+
+_sessions = {}
+_session_pid = None
+_lock = threading.Lock()
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The request's latency budget ran out before a usable response arrived"""
+
+
+def _build_session(retries: bool = True) -> requests.Session:
+    attempts = MAX_RETRIES - 1 if retries else 0  # MAX_RETRIES counts attempts, Retry counts re-tries
+    retry = Retry(
+        total=attempts,
+        connect=attempts,
+        read=attempts,
+        status=attempts,
+        backoff_factor=HTTP_CLIENT_SETTINGS['backoff_factor'],
+        status_forcelist=HTTP_CLIENT_SETTINGS['retry_statuses'],
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the final 429/5xx back to the caller
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_CLIENT_SETTINGS['pool_connections'],
+        pool_maxsize=HTTP_CLIENT_SETTINGS['pool_maxsize'],
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    if FIXTURE_API_SETTINGS['mode'] == 'transport':
+        from fixture_api import mount_fixture_transport
+        mount_fixture_transport(session)  # Longer prefix than http(s)://, so it wins for API endpoints
+    return session
+
+
+def get_session(retries: bool = True) -> requests.Session:
+    """Return this process's shared Session (rebuilt after fork; safe to share across threads for GETs)"""
+    global _sessions, _session_pid
+    pid = os.getpid()
+    session = _sessions.get(retries) if _session_pid == pid else None
+    if session is None:
+        with _lock:
+            if _session_pid != pid:
+                _sessions = {}
+                _session_pid = pid
+            session = _sessions.get(retries)
+            if session is None:
+                session = _sessions[retries] = _build_session(retries)
+    return session
+
+
+def get_with_deadline(url: str, deadline: float, **kwargs) -> requests.Response:
+    """
+    GET with the same retry policy as get_session(), but every attempt, backoff sleep
+    and timeout fits before `deadline` (a time.monotonic() value). Raises DeadlineExceeded
+    when no attempt can start in time; the last 5xx is returned if a retry would not fit.
+    """
+    session = get_session(retries=False)
+    connect, read = request_timeout()
+    min_attempt = SEARCH_BUDGET_SETTINGS['min_attempt_seconds']
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        left = deadline - time.monotonic()
+        if left < min_attempt:
+            raise DeadlineExceeded(f"latency budget exhausted before attempt {attempt}")
+
+        response = None
+        try:
+            response = session.get(url, timeout=(min(connect, left), min(read, left)), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES or deadline - time.monotonic() < min_attempt:
+                raise DeadlineExceeded(f"no response within the latency budget (attempt {attempt})")
+        else:
+            if response.status_code not in HTTP_CLIENT_SETTINGS['retry_statuses'] or attempt == MAX_RETRIES:
+                return response
+
+        pause = HTTP_CLIENT_SETTINGS['backoff_factor'] * (2 ** (attempt - 1))
+        if time.monotonic() + pause + min_attempt > deadline:
+            if response is not None:
+                return response
+            raise DeadlineExceeded("no time left to retry within the latency budget")
+        time.sleep(pause)
+
+
+def request_timeout():
+    """(connect, read) timeout tuple for platform API calls"""
+    return (HTTP_CLIENT_SETTINGS['connect_timeout'], HTTP_CLIENT_SETTINGS['read_timeout'])
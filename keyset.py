@@ -0,0 +1,63 @@
+"""
+Keyset (cursor) pagination helpers for the admin listings
+A page continues strictly after the last row of the previous one on (sort column, id),
+so every page is an index range scan of LIMIT rows however deep the client pages,
+unlike OFFSET which reads and discards all earlier rows.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+from config import ADMIN_LIST_SETTINGS
+
+
+def encode_cursor(sort: str, value, row_id) -> str:
+    """Opaque URL-safe cursor for the row a page ended on"""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    elif isinstance(value, Decimal):
+        value = {'dec': str(value)}
+    raw = json.dumps([sort, value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[object, object]:
+    """(sort value, id) from a cursor; ValueError if it is malformed or from another sort order"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if cursor_sort != sort:
+        raise ValueError('Cursor belongs to a different sort order')
+    if isinstance(value, dict):
+        value = datetime.fromisoformat(value['dt']) if 'dt' in value else Decimal(value['dec'])
+    return value, row_id
+
+
+def page_size_param(value) -> int:
+    """Requested page size, defaulted and capped by ADMIN_LIST_SETTINGS"""
+    size = int(value or ADMIN_LIST_SETTINGS['page_size'])
+    if size < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(size, ADMIN_LIST_SETTINGS['max_page_size'])
+
+
+def keyset_condition(column: str, id_column: str, descending: bool, cursor_value) -> Tuple[str, List]:
+    """WHERE fragment selecting rows after (value, id) in ORDER BY column, id_column [DESC]"""
+    value, row_id = cursor_value
+    op = '<' if descending else '>'
+    if column == id_column:
+        return f"{id_column} {op} %s", [row_id]
+    # Expanded form rather than a row constructor so MySQL uses a range on the index
+    return f"({column} {op} %s OR ({column} = %s AND {id_column} {op} %s))", [value, value, row_id]
+
+
+def next_cursor(rows: Sequence[dict], limit: int, sort: str, sort_key: str, id_key: str) -> Optional[str]:
+    """Cursor after the last row of a page fetched with LIMIT limit + 1, or None on the last page"""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(sort, last[sort_key], last[id_key])
@@ -0,0 +1,43 @@
+"""
+Lightweight metrics registry rendered in Prometheus text format at /metrics
+"""
+import threading
+from typing import Callable, Dict
+
+METRIC_PREFIX = 'smartshop'
+
+_collectors: Dict[str, Callable[[], Dict]] = {}
+_lock = threading.Lock()
+
+
+def register_collector(name: str, collector: Callable[[], Dict]):
+    """Register a callable returning a flat {metric: number} dict"""
+    with _lock:
+        _collectors[name] = collector
+
+
+def collect() -> Dict[str, Dict]:
+    """Snapshot every registered collector"""
+    with _lock:
+        collectors = dict(_collectors)
+
+    snapshot = {}
+    for name, collector in collectors.items():
+        try:
+            snapshot[name] = collector()
+        except Exception as e:
+            print(f"⚠️ Metrics collector '{name}' failed: {e}")
+    return snapshot
+
+
+def render_prometheus() -> str:
+    """Render all collectors as Prometheus exposition text"""
+    lines = []
+    for name, values in sorted(collect().items()):
+        for key, value in sorted(values.items()):
+            if isinstance(value, bool):
+                value = int(value)
+            if not isinstance(value, (int, float)):
+                continue
+            lines.append(f"{METRIC_PREFIX}_{name}_{key} {value}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,315 @@
+"""
+Versioned schema migrations for every table the app uses, plus a query-plan check
+Applied versions are recorded in schema_migrations; every step is idempotent
+(CREATE TABLE IF NOT EXISTS, indexes created only when missing), so databases set up
+by hand or by older versions of setup_database.py / sql_scraper.py migrate cleanly.
+check_query_plans() EXPLAINs the hot queries and reports any that fall back to a
+full table scan.
+Usage: python migrations.py [--check | --status]
+"""
+import sys
+from typing import Dict, List, NamedTuple, Sequence, Union
+
+import mysql.connector
+
+from config import DB_CONFIG
+from prediction_rollups import TABLES as ROLLUP_TABLES
+
+
+class Index(NamedTuple):
+    table: str
+    name: str
+    columns: str  # e.g. '(category, platform, cached_at)'
+
+
+class NotNull(NamedTuple):
+    """Backfill NULLs with each column's default, then make the columns NOT NULL keeping their types"""
+    table: str
+    defaults: Dict[str, Union[int, float]]  # column -> numeric default
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    steps: Sequence[Union[str, Index, NotNull]]
+
+
+MIGRATIONS = [
+    Migration(1, 'core tables', [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            email VARCHAR(255) NOT NULL UNIQUE,
+            password VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            product_id INT AUTO_INCREMENT PRIMARY KEY,
+            platform VARCHAR(50) NOT NULL,
+            sku VARCHAR(20) NOT NULL,
+            product_name VARCHAR(255) NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            price DECIMAL(10, 2) NOT NULL,
+            discount_percent DECIMAL(5, 2) DEFAULT 0,
+            discounted_price DECIMAL(10, 2),
+            rating DECIMAL(3, 2) DEFAULT 4.0,
+            stock INT DEFAULT 100,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_email VARCHAR(255) NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            budget DECIMAL(10, 2) NOT NULL,
+            platform VARCHAR(50),
+            predicted_discount DECIMAL(5, 2) NOT NULL,
+            predicted_platform VARCHAR(50) NOT NULL,
+            discounted_price DECIMAL(10, 2) NOT NULL,
+            savings DECIMAL(10, 2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    ]),
+    Migration(2, 'product cache, product cards and scraped products', [
+        # API results cached by api_integrations (category holds the search query)
+        """
+        CREATE TABLE IF NOT EXISTS product_cache (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            platform VARCHAR(50) NOT NULL,
+            product_name VARCHAR(255) NOT NULL,
+            category VARCHAR(255) NOT NULL,
+            price DECIMAL(10, 2) NOT NULL,
+            discounted_price DECIMAL(10, 2) NOT NULL,
+            discount_percent DECIMAL(5, 2) NOT NULL,
+            rating DECIMAL(3, 1),
+            stock INT DEFAULT 0,
+            image_url TEXT,
+            product_url TEXT,
+            sku VARCHAR(50),
+            savings DECIMAL(10, 2),
+            cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_product_cache_item (platform, category, product_name)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS admin_product_cards (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            product_url TEXT NOT NULL,
+            image_url TEXT NOT NULL,
+            product_name VARCHAR(255) NOT NULL,
+            price VARCHAR(50) NOT NULL,
+            rating VARCHAR(10) DEFAULT '4.5',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Written by sql_scraper.py
+        """
+        CREATE TABLE IF NOT EXISTS products_data (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            product_name VARCHAR(500),
+            price VARCHAR(100),
+            rating VARCHAR(50),
+            review_count VARCHAR(50),
+            image_url TEXT,
+            url TEXT,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            additional_data JSON
+        )
+        """
+    ]),
+    Migration(3, 'admin listing indexes', [
+        # Keyset pages of /api/admin/products: each filter/sort ends in product_id.
+        # The category/platform prefixes also serve the products(category) and
+        # products(platform) lookups (dropdowns, analytics, training exports).
+        Index('products', 'idx_products_category_id', '(category, product_id)'),
+        Index('products', 'idx_products_platform_id', '(platform, product_id)'),
+        Index('products', 'idx_products_category_price', '(category, price, product_id)'),
+        Index('products', 'idx_products_platform_price', '(platform, price, product_id)'),
+        Index('products', 'idx_products_price_id', '(price, product_id)'),
+        Index('products', 'idx_products_discount_id', '(discount_percent, product_id)'),
+        Index('products', 'idx_products_rating_id', '(rating, product_id)'),
+        # Newest-first pages of /api/admin/users
+        Index('users', 'idx_users_created_id', '(created_at, id)')
+    ]),
+    Migration(4, 'hot query indexes', [
+        Index('product_cache', 'idx_product_cache_lookup', '(category, platform, cached_at)'),
+        Index('predictions', 'idx_predictions_created', '(created_at)'),
+        Index('admin_product_cards', 'idx_product_cards_created', '(created_at)')
+    ]),
+    Migration(5, 'prediction rollups', list(ROLLUP_TABLES.values())),
+    Migration(6, 'non-null product sort columns', [
+        # Keyset pages sorted by rating/discount compare (value, id); NULL never compares,
+        # so NULL rows were unreachable. Backfill the column defaults, then forbid NULL.
+        # Column types are left as they are (e.g. INT / DECIMAL(2,1) from project_smart.sql).
+        NotNull('products', {'discount_percent': 0, 'rating': 4.0})
+    ])
+]
+
+# (name, EXPLAIN-able SQL, params) mirroring the queries on the request paths
+HOT_QUERIES = [
+    ('product_cache lookup (api_integrations._get_cached_products)',
+     "SELECT * FROM product_cache WHERE category = %s AND platform = %s "
+     "AND cached_at > NOW() - INTERVAL 6 HOUR LIMIT 30", ('headphones', 'Amazon')),
+    ('product_cache expiry (api_integrations._write_cache_rows)',
+     "DELETE FROM product_cache WHERE category = %s AND platform = %s "
+     "AND cached_at < NOW() - INTERVAL 6 HOUR", ('headphones', 'Amazon')),
+    ('recent predictions (admin_stats)',
+     "SELECT id, user_email, category, created_at FROM predictions ORDER BY created_at DESC LIMIT 10", ()),
+    ('prediction trend window (admin_stats)',
+     "SELECT category, COUNT(*) FROM predictions WHERE created_at >= NOW() - INTERVAL 30 DAY "
+     "GROUP BY category", ()),
+    ('products by category',
+     "SELECT product_id, price FROM products WHERE category = %s", ('Mobile',)),
+    ('products by platform',
+     "SELECT product_id, price FROM products WHERE platform = %s", ('Amazon',)),
+    ('admin products page by price',
+     "SELECT product_id FROM products WHERE category = %s "
+     "ORDER BY price DESC, product_id DESC LIMIT 51", ('Mobile',)),
+    ('admin users page',
+     "SELECT id, email FROM users ORDER BY created_at DESC, id DESC LIMIT 51", ()),
+    ('admin users email prefix',
+     "SELECT id, email FROM users WHERE email LIKE %s ORDER BY created_at DESC, id DESC LIMIT 51", ('adm%',)),
+    ('product cards',
+     "SELECT id, product_name FROM admin_product_cards ORDER BY created_at DESC LIMIT 500", ())
+]
+
+
+def ensure_index(cursor, table: str, name: str, columns: str) -> bool:
+    """CREATE INDEX unless it exists (MySQL has no CREATE INDEX IF NOT EXISTS)"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, name))
+    if cursor.fetchone()[0]:
+        return False
+    cursor.execute(f"CREATE INDEX {name} ON {table} {columns}")
+    print(f"✅ Created index {name} on {table}{columns}")
+    return True
+
+
+def ensure_not_null(cursor, table: str, defaults: Dict[str, Union[int, float]]) -> bool:
+    """
+    MODIFY the nullable columns among defaults to NOT NULL DEFAULT <default>, each with its
+    current type from information_schema, in one ALTER (one table rebuild)
+    """
+    modify = []
+    for column, default in defaults.items():
+        cursor.execute("""
+            SELECT column_type, is_nullable FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """, (table, column))
+        row = cursor.fetchone()
+        if row is None:
+            raise RuntimeError(f"Column {table}.{column} does not exist")
+        column_type, is_nullable = row
+        if is_nullable == 'YES':
+            cursor.execute(f"UPDATE {table} SET {column} = %s WHERE {column} IS NULL", (default,))
+            modify.append(f"MODIFY {column} {column_type} NOT NULL DEFAULT {default!r}")
+    if not modify:
+        return False
+    cursor.execute(f"ALTER TABLE {table} {', '.join(modify)}")
+    print(f"✅ {table}: {', '.join(modify)}")
+    return True
+
+
+def applied_versions(cursor) -> List[int]:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def migrate(conn) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied"""
+    cursor = conn.cursor()
+    # One runner at a time (several workers/containers may start together)
+    cursor.execute("SELECT GET_LOCK('schema_migrations', 60)")
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise RuntimeError("Timed out waiting for the schema_migrations lock")
+    try:
+        done = set(applied_versions(cursor))
+        applied = []
+        for migration in MIGRATIONS:
+            if migration.version in done:
+                continue
+            print(f"⏳ Migration {migration.version}: {migration.name}")
+            for step in migration.steps:
+                if isinstance(step, Index):
+                    ensure_index(cursor, *step)
+                elif isinstance(step, NotNull):
+                    ensure_not_null(cursor, *step)
+                else:
+                    cursor.execute(step)
+            # DDL commits implicitly, so a failed migration is re-run from the top; every step is idempotent
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                           (migration.version, migration.name))
+            conn.commit()
+            applied.append(migration.version)
+        return applied
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('schema_migrations')")
+        cursor.fetchone()
+        cursor.close()
+
+
+def check_query_plans(conn) -> List[str]:
+    """
+    EXPLAIN every HOT_QUERIES entry and return the ones that scan a whole table.
+    max_seeks_for_key=1 makes the optimizer cost index access as it would on a large
+    table, so a small dev/CI database doesn't turn usable indexes into full scans.
+    """
+    cursor = conn.cursor(dictionary=True)
+    problems = []
+    try:
+        cursor.execute("SET SESSION max_seeks_for_key = 1")
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            for row in cursor.fetchall():
+                table = row.get('table') or ''
+                if row.get('type') == 'ALL' and not table.startswith('<'):
+                    problems.append(f"{name}: full scan of {table} (possible_keys={row.get('possible_keys')})")
+    finally:
+        cursor.execute("SET SESSION max_seeks_for_key = DEFAULT")
+        cursor.close()
+    return problems
+
+
+def main():
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        if '--status' in sys.argv:
+            cursor = conn.cursor()
+            done = set(applied_versions(cursor))
+            cursor.close()
+            for migration in MIGRATIONS:
+                print(f"{'✅' if migration.version in done else '⏳'} {migration.version}: {migration.name}")
+            return 0
+
+        if '--check' in sys.argv:
+            problems = check_query_plans(conn)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if not problems:
+                print(f"✅ All {len(HOT_QUERIES)} hot queries use an index")
+            return 1 if problems else 0
+
+        applied = migrate(conn)
+        print(f"✅ Applied migrations {applied}" if applied else "✅ Schema is up to date")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
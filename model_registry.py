@@ -0,0 +1,261 @@
+"""
+Lazy, hot-swappable registry for the trained ML artifacts
+
+Models load on first use instead of at import, so scripts that only need
+DB settings never pay for unpickling. For gunicorn, set MODEL_PRELOAD=1 and run
+with --preload: the master loads once and forked workers share the pages
+copy-on-write. If a <name>.joblib copy of an artifact exists it is loaded with
+mmap_mode='r' so its numpy buffers are shared read-only through the page cache
+(create them with `python model_registry.py --export-joblib`).
+"""
+import itertools
+import os
+import pickle
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import MODEL_SETTINGS
+from metrics import register_collector
+
+try:
+    import joblib
+except ImportError:  # joblib ships with scikit-learn, but stay importable without it
+    joblib = None
+
+ARTIFACTS = [
+    'label_encoders',
+    'platform_model',
+    'platform_scaler',
+    'discount_model',
+    'discount_scaler',
+    'model_metadata'
+]
+
+
+class ModelBundle:
+    """One immutable, fully loaded set of artifacts; indexable like the old globals"""
+
+    def __init__(self, version: int, model_dir: str, artifacts: Dict, load_seconds: Dict, signature: tuple):
+        self.version = version
+        self.model_dir = model_dir
+        self.artifacts = artifacts
+        self.load_seconds = load_seconds
+        self.signature = signature
+        self.loaded_at = time.time()
+
+    def __getitem__(self, name):
+        return self.artifacts[name]
+
+    def get(self, name, default=None):
+        return self.artifacts.get(name, default)
+
+
+class ModelRegistry:
+    """Loads ModelBundles lazily and swaps in new versions atomically"""
+
+    def __init__(self, model_dir: str = '.', mmap: bool = True, watch_seconds: float = 0,
+                 retry_seconds: float = 30):
+        self.model_dir = model_dir
+        self.mmap = mmap and joblib is not None
+        self.watch_seconds = watch_seconds
+        self.retry_seconds = retry_seconds
+
+        self._bundle: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[ModelBundle], None]] = []
+        self._versions = itertools.count(1)
+        self._last_error = None
+        self._retry_at = 0.0  # After a failed first load, don't try again before this (monotonic)
+        self._next_watch_check = 0.0
+        self._reloading = False
+        self._reloads = 0
+        self._load_failures = 0
+
+    def add_listener(self, listener: Callable[[ModelBundle], None]):
+        """Call listener(bundle) after every successful load or swap"""
+        self._listeners.append(listener)
+
+    def get(self) -> ModelBundle:
+        """Return the active bundle, loading it on first use"""
+        bundle = self._bundle
+        if bundle is None:
+            loaded = None
+            with self._lock:
+                if self._bundle is None:
+                    if time.monotonic() < self._retry_at:
+                        raise RuntimeError(f"Model load failed recently, retrying later: {self._last_error}")
+                    try:
+                        loaded = self._load(self.model_dir)
+                    except Exception as e:
+                        self._last_error = str(e)
+                        self._retry_at = time.monotonic() + self.retry_seconds
+                        raise
+                    self._swap(loaded)
+                bundle = self._bundle
+            if loaded is not None:
+                self._notify(loaded)
+        elif self.watch_seconds:
+            self._maybe_watch_reload(bundle)
+        return bundle
+
+    def try_get(self) -> Optional[ModelBundle]:
+        """Like get(), but returns None (and logs) when the artifacts cannot be loaded"""
+        if self._bundle is None and time.monotonic() < self._retry_at:
+            return None  # Failed recently: no load attempt (or log line) per request until the backoff ends
+        try:
+            return self.get()
+        except Exception as e:
+            self._last_error = str(e)
+            print(f"❌ Error loading ML models: {e}")
+            print("⚠️ Please run model_training.py first to train and save the models.")
+            return None
+
+    def preload(self) -> Optional[ModelBundle]:
+        """Load eagerly, e.g. in the gunicorn master before workers fork"""
+        return self.try_get()
+
+    def reload(self) -> ModelBundle:
+        """Load a new version from model_dir and swap it in"""
+        bundle = self._load(self.model_dir)
+        with self._lock:
+            self._swap(bundle)
+            self._reloads += 1
+        self._notify(bundle)
+        return bundle
+
+    def _swap(self, bundle: ModelBundle):
+        """Make bundle the active version; called with self._lock held"""
+        self._bundle = bundle
+        self._last_error = None
+        self._retry_at = 0.0
+
+    def _notify(self, bundle: ModelBundle):
+        """
+        Run the listeners outside the lock so get() never waits on them (the prediction
+        table rebuild takes seconds); consumers check bundle.version, as the table does
+        """
+        for listener in self._listeners:
+            try:
+                listener(bundle)
+            except Exception as e:
+                print(f"⚠️ Model listener failed for version {bundle.version}: {e}")
+
+    def _maybe_watch_reload(self, bundle: ModelBundle):
+        now = time.monotonic()
+        if now < self._next_watch_check or self._reloading:
+            return
+        self._next_watch_check = now + self.watch_seconds
+        if self._signature(self.model_dir) == bundle.signature:
+            return
+
+        # Swap in the background so the request that noticed the change isn't blocked
+        self._reloading = True
+
+        def run():
+            try:
+                print(f"🔄 Model files changed in {self.model_dir}, reloading...")
+                self.reload()
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"⚠️ Model reload failed, keeping version {bundle.version}: {e}")
+            finally:
+                self._reloading = False
+
+        threading.Thread(target=run, name='model-reload', daemon=True).start()
+
+    def _signature(self, model_dir: str) -> tuple:
+        signature = []
+        for name in ARTIFACTS:
+            path = self._artifact_path(model_dir, name)
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _artifact_path(self, model_dir: str, name: str) -> str:
+        joblib_path = os.path.join(model_dir, f'{name}.joblib')
+        if self.mmap and os.path.exists(joblib_path):
+            return joblib_path
+        return os.path.join(model_dir, f'{name}.pkl')
+
+    def _load(self, model_dir: str) -> ModelBundle:
+        print(f"\nLoading ML models from {os.path.abspath(model_dir)}...")
+        signature = self._signature(model_dir)
+        artifacts, load_seconds = {}, {}
+        try:
+            for name in ARTIFACTS:
+                path = self._artifact_path(model_dir, name)
+                start = time.perf_counter()
+                if path.endswith('.joblib'):
+                    artifacts[name] = joblib.load(path, mmap_mode='r')
+                else:
+                    with open(path, 'rb') as f:
+                        artifacts[name] = pickle.load(f)
+                load_seconds[name] = time.perf_counter() - start
+        except Exception:
+            self._load_failures += 1
+            raise
+
+        version = next(self._versions)
+        total = sum(load_seconds.values())
+        print(f"✅ ML models loaded successfully! (version {version}, {total:.2f}s)")
+        return ModelBundle(version, model_dir, artifacts, load_seconds, signature)
+
+    def status(self) -> Dict:
+        bundle = self._bundle
+        return {
+            'loaded': bundle is not None,
+            'version': bundle.version if bundle else None,
+            'model_dir': bundle.model_dir if bundle else self.model_dir,
+            'loaded_at': bundle.loaded_at if bundle else None,
+            'load_seconds': {k: round(v, 4) for k, v in bundle.load_seconds.items()} if bundle else {},
+            'mmap': self.mmap,
+            'watch_seconds': self.watch_seconds,
+            'retry_in_seconds': round(max(0.0, self._retry_at - time.monotonic()), 1),
+            'last_error': self._last_error
+        }
+
+    def metrics(self) -> Dict:
+        bundle = self._bundle
+        values = {
+            'loaded': bundle is not None,
+            'version': bundle.version if bundle else 0,
+            'reloads_total': self._reloads,
+            'load_failures_total': self._load_failures
+        }
+        if bundle:
+            for name, seconds in bundle.load_seconds.items():
+                values[f'{name}_load_seconds'] = round(seconds, 6)
+        return values
+
+
+def export_joblib(model_dir: str = '.'):
+    """Write a .joblib copy of every .pkl artifact so it can be memory-mapped"""
+    if joblib is None:
+        raise RuntimeError("joblib is not installed")
+    for name in ARTIFACTS:
+        src = os.path.join(model_dir, f'{name}.pkl')
+        with open(src, 'rb') as f:
+            obj = pickle.load(f)
+        joblib.dump(obj, os.path.join(model_dir, f'{name}.joblib'))
+        print(f"✅ Exported {name}.joblib")
+
+
+model_registry = ModelRegistry(
+    MODEL_SETTINGS['model_dir'],
+    mmap=MODEL_SETTINGS['mmap'],
+    watch_seconds=MODEL_SETTINGS['watch_seconds'],
+    retry_seconds=MODEL_SETTINGS['retry_seconds']
+)
+register_collector('models', model_registry.metrics)
+
+
+if __name__ == '__main__':
+    if '--export-joblib' in sys.argv:
+        export_joblib(MODEL_SETTINGS['model_dir'])
+    else:
+        print(model_registry.preload() and model_registry.status())
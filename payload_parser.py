@@ -0,0 +1,238 @@
+"""
+Schema-driven parsing of platform search payloads into ProductRecords
+One PayloadSchema per platform describes where the product list and each field live;
+a single parse loop with precompiled patterns and a fast numeric normalizer handles
+every platform, and rejected items are counted by reason instead of silently skipped.
+"""
+import random
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config import COMPARISON_SETTINGS
+from metrics import register_collector
+from product_record import ProductRecord
+
+try:
+    import orjson
+except ImportError:  # Optional: ~2-3x faster JSON decoding when installed
+    orjson = None
+
+_NUMBER = re.compile(r'[\d,]+\.?\d*')
+_RATING = re.compile(r'[\d.]+')
+
+
+class PayloadSchema(NamedTuple):
+    """Field extraction table for one platform's search payload"""
+    list_paths: Tuple[Tuple[str, ...], ...]  # Candidate key paths to the product list, tried in order
+    name_fields: Tuple[str, ...]
+    price_fields: Tuple[str, ...]
+    mrp_fields: Tuple[str, ...]
+    rating_fields: Tuple[str, ...]
+    url_fields: Tuple[str, ...]
+    image_fields: Tuple[str, ...]
+    sku_field: str
+    sku_prefix: str
+    search_url: str  # Fallback product link, formatted with {query}
+    mrp_markup: float  # Assumed MRP (x sale price) when the payload has none
+    usd_below: float = 0  # Prices under this (or with '$') are USD and get converted
+    max_price: float = None  # Drop prices above this (parse errors rather than real offers)
+    default_rating: float = 4.0
+
+
+# Only payload shapes backed by a recorded response in fixtures/ (<platform>_search.json).
+# Myntra, AJIO and Meesho have adapters but stay disabled until their schema is added here
+# with a fixture of the real endpoint's payload.
+SCHEMAS: Dict[str, PayloadSchema] = {
+    'Amazon': PayloadSchema(
+        list_paths=(('data', 'products'), ('data',), ('products',)),
+        name_fields=('product_title', 'title', 'name'),
+        price_fields=('product_price', 'price'),
+        mrp_fields=('product_original_price',),
+        rating_fields=('product_star_rating', 'rating'),
+        url_fields=('product_url', 'link'),
+        image_fields=('product_photo', 'image'),
+        sku_field='asin', sku_prefix='AMZ',
+        search_url='https://www.amazon.in/s?k={query}',
+        mrp_markup=1.20, usd_below=100, max_price=1000000
+    ),
+    'Flipkart': PayloadSchema(
+        list_paths=(('products',), ('data',), ('results',)),
+        name_fields=('name', 'title', 'product_name'),
+        price_fields=('current_price', 'price'),
+        mrp_fields=('original_price', 'mrp'),
+        rating_fields=('rating',),
+        url_fields=('link', 'url'),
+        image_fields=('image', 'thumbnail'),
+        sku_field='id', sku_prefix='FLP',
+        search_url='https://www.flipkart.com/search?q={query}',
+        mrp_markup=1.25
+    )
+}
+
+ERROR_REASONS = ('not_object', 'missing_name', 'bad_price', 'price_out_of_range', 'discount_filtered', 'error')
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def decode_json(body: bytes):
+    """Decode a response body, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(body)
+    import json
+    return json.loads(body)
+
+
+def parse_number(value) -> Tuple[Optional[float], bool]:
+    """
+    Normalize a price/number field: (value, is_usd). Handles numbers, '₹1,299.00',
+    '$12.99', 'Rs. 999' and similar; (None, False) when no number is present.
+    """
+    cls = type(value)
+    if cls is float or cls is int:
+        return float(value), False
+    if not value:
+        return None, False
+    text = value if cls is str else str(value)
+    match = _NUMBER.search(text)
+    if not match:
+        return None, False
+    digits = match.group().replace(',', '')
+    try:
+        return float(digits), '$' in text
+    except ValueError:  # e.g. a lone ','
+        return None, False
+
+
+def parse_rating(value, default: float) -> float:
+    """Rating clamped to 1-5 from a number or text such as '4.3 out of 5 stars'"""
+    cls = type(value)
+    if cls is float or cls is int:
+        rating = float(value)
+    else:
+        match = _RATING.search(value if cls is str else str(value)) if value else None
+        try:
+            rating = float(match.group()) if match else default
+        except ValueError:  # e.g. '..'
+            rating = default
+    return 1.0 if rating < 1.0 else 5.0 if rating > 5.0 else rating
+
+
+def _first(get, fields: Sequence[str]):
+    """First truthy value among fields, given the item's bound .get"""
+    for field in fields:
+        value = get(field)
+        if value:
+            return value
+    return None
+
+
+def product_list(schema: PayloadSchema, data) -> List:
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    for path in schema.list_paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, list):
+            return value
+    return []
+
+
+def parse_products(platform: str, data, query: str, show_images: bool = False,
+                   usd_to_inr: float = 1.0, limit: int = None) -> List[ProductRecord]:
+    """Parse one search payload into ProductRecords, counting rejected items by reason"""
+    schema = SCHEMAS[platform]
+    limit = COMPARISON_SETTINGS['max_products_per_platform'] if limit is None else limit
+    min_discount = COMPARISON_SETTINGS['min_discount_threshold']
+    category = query.title()
+    search_url = schema.search_url.format(query=query.replace(' ', '+'))
+    (name_fields, price_fields, mrp_fields, rating_fields, url_fields, image_fields,
+     sku_field, usd_below, markup, max_price, default_rating) = (
+        schema.name_fields, schema.price_fields, schema.mrp_fields, schema.rating_fields, schema.url_fields,
+        schema.image_fields, schema.sku_field, schema.usd_below, schema.mrp_markup,
+        schema.max_price or float('inf'), schema.default_rating)
+    rand = random.random
+
+    items = product_list(schema, data)[:limit]
+    errors = dict.fromkeys(ERROR_REASONS, 0)
+    products = []
+    append = products.append
+    for item in items:
+        if type(item) is not dict:
+            errors['not_object'] += 1
+            continue
+        get = item.get
+        try:
+            product_name = _first(get, name_fields)
+            product_name = product_name.strip() if type(product_name) is str else str(product_name or '').strip()
+            if len(product_name) < 3:
+                errors['missing_name'] += 1
+                continue
+
+            current_price, is_usd = parse_number(_first(get, price_fields))
+            if current_price is None:
+                errors['bad_price'] += 1
+                continue
+            if usd_below and (is_usd or current_price < usd_below):
+                current_price *= usd_to_inr
+            if current_price < 10 or current_price > max_price:
+                errors['price_out_of_range'] += 1
+                continue
+
+            original_price, mrp_usd = parse_number(_first(get, mrp_fields))
+            if original_price and mrp_usd and usd_below:
+                original_price *= usd_to_inr
+            if not original_price or original_price <= current_price:
+                original_price = current_price * markup
+
+            discount_percent = round((original_price - current_price) / original_price * 100, 2)
+            if discount_percent < min_discount or discount_percent > 90:
+                errors['discount_filtered'] += 1
+                continue
+
+            sku = get(sku_field)
+            append(ProductRecord(
+                platform,
+                product_name[:200],
+                category,
+                round(original_price, 2),
+                round(current_price, 2),
+                discount_percent,
+                round(parse_rating(_first(get, rating_fields), default_rating), 1),
+                50 + int(rand() * 151),
+                _first(get, url_fields) or search_url,
+                (_first(get, image_fields) or '') if show_images else '',
+                sku if sku is not None else f"{schema.sku_prefix}{1000 + int(rand() * 9000)}",
+                round(original_price - current_price, 2)
+            ))
+        except (TypeError, ValueError, AttributeError):
+            errors['error'] += 1
+
+    _record(platform, len(items), len(products), errors)
+    return products
+
+
+def _record(platform: str, items: int, parsed: int, errors: Dict[str, int]):
+    with _stats_lock:
+        stats = _stats.get(platform)
+        if stats is None:
+            stats = _stats[platform] = dict.fromkeys(('payloads_total', 'items_total', 'parsed_total') +
+                                                     tuple(f'rejected_{r}_total' for r in ERROR_REASONS), 0)
+        stats['payloads_total'] += 1
+        stats['items_total'] += items
+        stats['parsed_total'] += parsed
+        for reason, count in errors.items():
+            stats[f'rejected_{reason}_total'] += count
+
+
+def parse_metrics() -> Dict:
+    with _stats_lock:
+        return {f'{platform.lower()}_{key}': value
+                for platform, stats in _stats.items() for key, value in stats.items()}
+
+
+register_collector('payload_parser', parse_metrics)
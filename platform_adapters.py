@@ -0,0 +1,134 @@
+"""
+Platform adapters for the multi-platform product search
+Each e-commerce platform is one PlatformAdapter (request building, response parsing,
+cache key and rate-limit policy) registered by name; MultiPlatformAPIIntegration and
+the async engine only talk to the registry.
+"""
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from config import API_KEYS, RAPIDAPI_ENDPOINTS, PLATFORM_ADAPTER_SETTINGS, PLATFORM_PRIORITY
+from payload_parser import SCHEMAS, parse_products
+from product_record import ProductRecord
+from rate_limiter import platform_rate_limiter
+
+
+class PlatformAdapter:
+    """Base adapter; subclasses set the class attributes (and a payload_parser.SCHEMAS entry)"""
+
+    name = None
+    endpoint_key = None   # Key in RAPIDAPI_ENDPOINTS
+    api_key_name = None   # Key in API_KEYS
+    host = None           # X-RapidAPI-Host (defaults to the endpoint's host)
+    rate_limit = None     # Default {'rate': ..., 'burst': ...}; RATE_LIMIT_SETTINGS['platforms'] wins
+
+    @property
+    def endpoint(self) -> str:
+        return RAPIDAPI_ENDPOINTS.get(self.endpoint_key, '')
+
+    @property
+    def api_key(self) -> str:
+        return API_KEYS.get(self.api_key_name, '')
+
+    def enabled(self) -> bool:
+        """Listed in PLATFORM_ADAPTER_SETTINGS, configured, and with a payload schema to parse responses"""
+        return (self.name in PLATFORM_ADAPTER_SETTINGS['enabled'] and self.name in SCHEMAS
+                and bool(self.endpoint and self.api_key))
+
+    def cache_key(self, query: str, min_price: float = None, max_price: float = None) -> tuple:
+        return (' '.join(query.lower().split()), self.name, min_price, max_price)
+
+    def build_request(self, query: str, min_price: float = None, max_price: float = None):
+        """(url, headers, params) for one search call"""
+        headers = {
+            'X-RapidAPI-Key': self.api_key,
+            'X-RapidAPI-Host': self.host or urlparse(self.endpoint).netloc
+        }
+        return self.endpoint, headers, self.params(query, min_price, max_price)
+
+    def params(self, query: str, min_price: float = None, max_price: float = None) -> Dict:
+        return {'query': query, 'page': '1'}
+
+    def parse(self, api, data: dict, query: str) -> List[ProductRecord]:
+        """Turn a 200 response body into products; api supplies show_images/usd_to_inr"""
+        if self.name not in SCHEMAS:
+            print(f"⚠️ No payload schema for {self.name}, ignoring response")
+            return []
+        return parse_products(self.name, data, query, api.show_images, api.usd_to_inr)
+
+
+class AmazonAdapter(PlatformAdapter):
+    name = 'Amazon'
+    endpoint_key = 'amazon_search'
+    api_key_name = 'amazon_api'
+    host = 'real-time-amazon-data.p.rapidapi.com'
+
+    def params(self, query, min_price=None, max_price=None):
+        params = {
+            'query': query,
+            'page': '1',
+            'country': 'IN',
+            'sort_by': 'RELEVANCE',
+            'product_condition': 'ALL'
+        }
+        if min_price:
+            params['min_price'] = str(int(min_price))
+        if max_price:
+            params['max_price'] = str(int(max_price))
+        return params
+
+
+class FlipkartAdapter(PlatformAdapter):
+    name = 'Flipkart'
+    endpoint_key = 'flipkart_search'
+    api_key_name = 'flipkart_api'
+    host = 'real-time-flipkart-data2.p.rapidapi.com'
+
+
+# No payload_parser.SCHEMAS entry yet (no recorded payload), so enabled() is False for these
+# even when their *_SEARCH_URL / *_API_KEY settings are provided (see config.py)
+
+class MyntraAdapter(PlatformAdapter):
+    name = 'Myntra'
+    endpoint_key = 'myntra_search'
+    api_key_name = 'myntra_api'
+
+
+class AjioAdapter(PlatformAdapter):
+    name = 'AJIO'
+    endpoint_key = 'ajio_search'
+    api_key_name = 'ajio_api'
+
+
+class MeeshoAdapter(PlatformAdapter):
+    name = 'Meesho'
+    endpoint_key = 'meesho_search'
+    api_key_name = 'meesho_api'
+
+
+_adapters: Dict[str, PlatformAdapter] = {}
+
+
+def register_adapter(adapter: PlatformAdapter):
+    """Add (or replace) the adapter for adapter.name"""
+    _adapters[adapter.name] = adapter
+    if adapter.rate_limit:
+        platform_rate_limiter.set_default_policy(adapter.name, adapter.rate_limit)
+
+
+def get_adapter(name: str) -> PlatformAdapter:
+    try:
+        return _adapters[name]
+    except KeyError:
+        raise ValueError(f"Unsupported platform: {name}")
+
+
+def enabled_adapters() -> List[PlatformAdapter]:
+    """Enabled adapters in PLATFORM_PRIORITY order (unlisted platforms last)"""
+    order = {name: i for i, name in enumerate(PLATFORM_PRIORITY)}
+    adapters = [a for a in _adapters.values() if a.enabled()]
+    return sorted(adapters, key=lambda a: order.get(a.name, len(order)))
+
+
+for _adapter in (AmazonAdapter(), FlipkartAdapter(), MyntraAdapter(), AjioAdapter(), MeeshoAdapter()):
+    register_adapter(_adapter)
@@ -0,0 +1,119 @@
+"""
+Vectorized scoring for the platform and discount models
+Builds one feature matrix per model so N requests cost one transform/predict call each
+"""
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# Budget thresholds that bucket a budget into price_range 0-4
+PRICE_RANGE_BOUNDS = [1000, 5000, 15000, 30000]
+
+# Fixed inputs the web form does not collect
+RATING_PREFERENCE = 4.0
+STOCK_ESTIMATE = 200
+STOCK_STATUS = 2
+DISCOUNT_ESTIMATE = 15
+DISCOUNT_EFFECTIVENESS = 0.15
+
+MAX_DISCOUNT = 50
+
+
+def price_range_for(budgets) -> np.ndarray:
+    """Vectorized budget -> price_range bucket (0: <1000 ... 4: >=30000)"""
+    return np.digitize(np.asarray(budgets, dtype=float), PRICE_RANGE_BOUNDS)
+
+
+def rating_category_for(rating: float) -> int:
+    if rating <= 3.5:
+        return 0
+    elif rating <= 4.0:
+        return 1
+    elif rating <= 4.5:
+        return 2
+    return 3
+
+
+def platform_features(category_encoded, budgets) -> np.ndarray:
+    """Feature matrix for the platform classifier (one row per request)"""
+    budgets = np.asarray(budgets, dtype=float)
+    n = len(budgets)
+    return np.column_stack([
+        category_encoded,
+        budgets,
+        np.full(n, DISCOUNT_ESTIMATE),
+        np.full(n, RATING_PREFERENCE),
+        np.full(n, STOCK_ESTIMATE),
+        price_range_for(budgets),
+        np.full(n, DISCOUNT_EFFECTIVENESS)
+    ]).astype(float)
+
+
+def discount_features(platform_encoded, category_encoded, budgets) -> np.ndarray:
+    """Feature matrix for the discount regressor (one row per request)"""
+    budgets = np.asarray(budgets, dtype=float)
+    n = len(budgets)
+    return np.column_stack([
+        platform_encoded,
+        category_encoded,
+        budgets,
+        np.full(n, RATING_PREFERENCE),
+        np.full(n, STOCK_ESTIMATE),
+        price_range_for(budgets),
+        np.full(n, rating_category_for(RATING_PREFERENCE)),
+        np.full(n, STOCK_STATUS)
+    ]).astype(float)
+
+
+def score_batch(models: Dict, categories: Sequence[str], budgets: Sequence[float],
+                platforms: Sequence[Optional[str]]) -> List[Dict]:
+    """
+    Score N (category, budget, platform) requests in one pass.
+    `platforms` entries may be None to let the platform model choose.
+    Unknown categories/platforms raise ValueError from the label encoders.
+    """
+    encoders = models['label_encoders']
+    n = len(categories)
+    budgets = np.asarray(budgets, dtype=float)
+    category_encoded = encoders['category'].transform(list(categories))
+
+    platform_encoded = np.zeros(n, dtype=np.int64)
+    best_platforms = np.empty(n, dtype=object)
+    confidence = np.full(n, 100.0)
+
+    given = np.array([bool(p) for p in platforms], dtype=bool)
+    if given.any():
+        given_names = [platforms[i] for i in np.flatnonzero(given)]
+        platform_encoded[given] = encoders['platform'].transform(given_names)
+        best_platforms[given] = given_names
+
+    auto = ~given
+    if auto.any():
+        scaled = models['platform_scaler'].transform(
+            platform_features(category_encoded[auto], budgets[auto])
+        )
+        # predict() is argmax(predict_proba()), so one forest pass gives both
+        proba = models['platform_model'].predict_proba(scaled)
+        predicted = models['platform_model'].classes_[proba.argmax(axis=1)]
+        platform_encoded[auto] = predicted
+        best_platforms[auto] = encoders['platform'].inverse_transform(predicted)
+        confidence[auto] = proba.max(axis=1) * 100
+
+    scaled = models['discount_scaler'].transform(
+        discount_features(platform_encoded, category_encoded, budgets)
+    )
+    discounts = np.clip(models['discount_model'].predict(scaled).astype(float), 0, MAX_DISCOUNT)
+    discounted_prices = budgets * (1 - discounts / 100)
+    savings = budgets - discounted_prices
+
+    return [
+        {
+            'category': categories[i],
+            'budget': float(budgets[i]),
+            'best_platform': str(best_platforms[i]),
+            'platform_confidence': float(confidence[i]),
+            'predicted_discount': float(discounts[i]),
+            'discounted_price': float(discounted_prices[i]),
+            'savings': float(savings[i])
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,296 @@
+"""
+Incremental rollups of the predictions table
+Hourly and daily summary rows (count, sum of predicted_discount, sum of savings) per
+category and predicted_platform, plus daily per-user rows, are maintained from a
+high-water mark on predictions.id. Each batch folds new rows in with
+INSERT ... SELECT ... ON DUPLICATE KEY UPDATE and advances the mark in the same
+transaction, so rows are counted exactly once; the state row is locked FOR UPDATE,
+so concurrent runners (one per gunicorn worker) serialize instead of double counting.
+Dashboards read only these tables, never the raw predictions.
+Usage: python prediction_rollups.py [--loop]
+"""
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+from config import ROLLUP_SETTINGS
+from db_pool import get_connection
+from metrics import register_collector
+
+STATE_NAME = 'predictions'
+
+TABLES = {
+    'prediction_rollup_state': """
+        CREATE TABLE IF NOT EXISTS prediction_rollup_state (
+            name VARCHAR(64) PRIMARY KEY,
+            last_id BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """,
+    'prediction_rollup_hourly': """
+        CREATE TABLE IF NOT EXISTS prediction_rollup_hourly (
+            bucket_start DATETIME NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            predicted_platform VARCHAR(50) NOT NULL,
+            prediction_count INT NOT NULL,
+            discount_sum DECIMAL(16, 2) NOT NULL,
+            savings_sum DECIMAL(18, 2) NOT NULL,
+            PRIMARY KEY (bucket_start, category, predicted_platform)
+        )
+    """,
+    'prediction_rollup_daily': """
+        CREATE TABLE IF NOT EXISTS prediction_rollup_daily (
+            bucket_date DATE NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            predicted_platform VARCHAR(50) NOT NULL,
+            prediction_count INT NOT NULL,
+            discount_sum DECIMAL(16, 2) NOT NULL,
+            savings_sum DECIMAL(18, 2) NOT NULL,
+            PRIMARY KEY (bucket_date, category, predicted_platform)
+        )
+    """,
+    'prediction_rollup_user_daily': """
+        CREATE TABLE IF NOT EXISTS prediction_rollup_user_daily (
+            bucket_date DATE NOT NULL,
+            user_email VARCHAR(255) NOT NULL,
+            prediction_count INT NOT NULL,
+            discount_sum DECIMAL(16, 2) NOT NULL,
+            savings_sum DECIMAL(18, 2) NOT NULL,
+            PRIMARY KEY (bucket_date, user_email)
+        )
+    """
+}
+
+_MERGE = """
+    ON DUPLICATE KEY UPDATE
+        prediction_count = prediction_count + VALUES(prediction_count),
+        discount_sum = discount_sum + VALUES(discount_sum),
+        savings_sum = savings_sum + VALUES(savings_sum)
+"""
+
+# Each statement aggregates predictions with id in (%s, %s]
+ROLLUP_STATEMENTS = (
+    """
+        INSERT INTO prediction_rollup_hourly
+            (bucket_start, category, predicted_platform, prediction_count, discount_sum, savings_sum)
+        SELECT DATE_FORMAT(created_at, '%%Y-%%m-%%d %%H:00:00'), category, predicted_platform,
+               COUNT(*), SUM(predicted_discount), SUM(savings)
+        FROM predictions WHERE id > %s AND id <= %s
+        GROUP BY 1, 2, 3
+    """ + _MERGE,
+    """
+        INSERT INTO prediction_rollup_daily
+            (bucket_date, category, predicted_platform, prediction_count, discount_sum, savings_sum)
+        SELECT DATE(created_at), category, predicted_platform,
+               COUNT(*), SUM(predicted_discount), SUM(savings)
+        FROM predictions WHERE id > %s AND id <= %s
+        GROUP BY 1, 2, 3
+    """ + _MERGE,
+    """
+        INSERT INTO prediction_rollup_user_daily
+            (bucket_date, user_email, prediction_count, discount_sum, savings_sum)
+        SELECT DATE(created_at), user_email, COUNT(*), SUM(predicted_discount), SUM(savings)
+        FROM predictions WHERE id > %s AND id <= %s
+        GROUP BY 1, 2
+    """ + _MERGE
+)
+
+
+class PredictionRollups:
+    def __init__(self, connection_factory: Callable, settings: Dict = None):
+        self.connection_factory = connection_factory
+        self.settings = dict(ROLLUP_SETTINGS, **(settings or {}))
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._tables_ready = False
+
+        self._runs = 0
+        self._rows_rolled = 0
+        self._failures = 0
+        self._last_run_seconds = 0.0
+        self._last_id = 0
+
+    def ensure_tables(self, conn):
+        """Create the rollup tables and seed the state row (committed), once per process"""
+        if self._tables_ready:
+            return
+        with self._lock:
+            if self._tables_ready:
+                return
+            cursor = conn.cursor()
+            try:
+                for ddl in TABLES.values():
+                    cursor.execute(ddl)
+                cursor.execute("INSERT IGNORE INTO prediction_rollup_state (name, last_id) VALUES (%s, 0)", (STATE_NAME,))
+                conn.commit()
+            finally:
+                cursor.close()
+            self._tables_ready = True
+
+    def run_batch(self, conn) -> int:
+        """Fold the next batch of settled predictions into the rollups; returns rows rolled up"""
+        self.ensure_tables(conn)
+        cursor = conn.cursor()
+        try:
+            conn.start_transaction()
+            cursor.execute("SELECT last_id FROM prediction_rollup_state WHERE name = %s FOR UPDATE", (STATE_NAME,))
+            state = cursor.fetchone()
+            if state is None:
+                # State row missing (e.g. deleted, or tables created elsewhere): start from the beginning
+                cursor.execute("INSERT IGNORE INTO prediction_rollup_state (name, last_id) VALUES (%s, 0)", (STATE_NAME,))
+                cursor.execute("SELECT last_id FROM prediction_rollup_state WHERE name = %s FOR UPDATE", (STATE_NAME,))
+                state = cursor.fetchone()
+            last_id = int(state[0])
+            # Next batch_size ids, cut before the first row younger than settle_seconds: a
+            # lower id from a slower concurrent insert may still commit after it
+            cursor.execute("""
+                SELECT MAX(id), MIN(CASE WHEN created_at >= NOW() - INTERVAL %s SECOND THEN id END)
+                FROM (SELECT id, created_at FROM predictions WHERE id > %s ORDER BY id LIMIT %s) AS batch
+            """, (self.settings['settle_seconds'], last_id, self.settings['batch_size']))
+            upper, first_unsettled = cursor.fetchone()
+            if first_unsettled is not None:
+                upper = first_unsettled - 1
+            if not upper or upper <= last_id:
+                conn.rollback()
+                self._last_id = last_id
+                return 0
+            cursor.execute("SELECT COUNT(*) FROM predictions WHERE id > %s AND id <= %s", (last_id, upper))
+            count = cursor.fetchone()[0]
+
+            for sql in ROLLUP_STATEMENTS:
+                cursor.execute(sql, (last_id, upper))
+            cursor.execute("UPDATE prediction_rollup_state SET last_id = %s WHERE name = %s", (upper, STATE_NAME))
+            conn.commit()
+            self._last_id = int(upper)
+            return int(count)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def run_once(self) -> int:
+        """Catch up completely (several batches if needed); returns rows rolled up"""
+        start = time.perf_counter()
+        conn = self.connection_factory()
+        total = 0
+        try:
+            while True:
+                rolled = self.run_batch(conn)
+                total += rolled
+                if rolled < self.settings['batch_size']:
+                    break
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            print(f"❌ Prediction rollup failed: {e}")
+            raise
+        finally:
+            conn.close()
+            with self._lock:
+                self._runs += 1
+                self._rows_rolled += total
+                self._last_run_seconds = time.perf_counter() - start
+        if total:
+            print(f"📊 Rolled up {total} predictions (through id {self._last_id})")
+        return total
+
+    def ensure_running(self):
+        """Start this process's periodic runner (lazily, and again after fork)"""
+        if self.settings['interval_seconds'] <= 0:
+            return
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is None or self._pid != pid:
+                self._pid = pid
+                self._thread = threading.Thread(target=self._loop, name='prediction-rollups', daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                pass  # Counted and logged in run_once; retry next interval
+            time.sleep(self.settings['interval_seconds'] or 60)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'runs_total': self._runs,
+                'rows_rolled_total': self._rows_rolled,
+                'failures_total': self._failures,
+                'last_run_seconds': self._last_run_seconds,
+                'high_water_mark': self._last_id
+            }
+
+
+def _averages(row: Dict) -> Dict:
+    count = int(row.pop('prediction_count'))
+    discount_sum = float(row.pop('discount_sum'))
+    savings_sum = float(row.pop('savings_sum'))
+    return dict(row, count=count,
+                avg_predicted_discount=round(discount_sum / count, 2) if count else 0.0,
+                avg_savings=round(savings_sum / count, 2) if count else 0.0)
+
+
+def read_series(cursor, granularity: str, days: int, category: str = None, platform: str = None) -> List[Dict]:
+    """Prediction count and averages per hour or day over the last `days` days, from the rollups"""
+    if granularity == 'hour':
+        table, bucket, since = 'prediction_rollup_hourly', 'bucket_start', 'NOW() - INTERVAL %s DAY'
+    elif granularity == 'day':
+        table, bucket, since = 'prediction_rollup_daily', 'bucket_date', 'CURDATE() - INTERVAL %s DAY'
+    else:
+        raise ValueError('granularity must be hour or day')
+    conditions, params = [f"{bucket} >= {since}"], [days]
+    if category:
+        conditions.append("category = %s")
+        params.append(category)
+    if platform:
+        conditions.append("predicted_platform = %s")
+        params.append(platform)
+    cursor.execute(f"""
+        SELECT {bucket} AS bucket, SUM(prediction_count) AS prediction_count,
+               SUM(discount_sum) AS discount_sum, SUM(savings_sum) AS savings_sum
+        FROM {table}
+        WHERE {' AND '.join(conditions)}
+        GROUP BY {bucket}
+        ORDER BY {bucket}
+    """, params)
+    return [_averages(row) for row in cursor.fetchall()]
+
+
+def read_breakdown(cursor, dimension: str, days: int, limit: int = 50) -> List[Dict]:
+    """Prediction count and averages per category, predicted platform or user over the last `days` days"""
+    columns = {'category': 'category', 'platform': 'predicted_platform', 'user': 'user_email'}
+    if dimension not in columns:
+        raise ValueError('dimension must be category, platform or user')
+    column = columns[dimension]
+    table = 'prediction_rollup_user_daily' if dimension == 'user' else 'prediction_rollup_daily'
+    cursor.execute(f"""
+        SELECT {column} AS `{dimension}`, SUM(prediction_count) AS prediction_count,
+               SUM(discount_sum) AS discount_sum, SUM(savings_sum) AS savings_sum
+        FROM {table}
+        WHERE bucket_date >= CURDATE() - INTERVAL %s DAY
+        GROUP BY {column}
+        ORDER BY prediction_count DESC
+        LIMIT %s
+    """, (days, limit))
+    return [_averages(row) for row in cursor.fetchall()]
+
+
+prediction_rollups = PredictionRollups(get_connection)
+register_collector('prediction_rollups', prediction_rollups.metrics)
+
+
+if __name__ == '__main__':
+    if '--loop' in sys.argv:
+        print(f"📊 Rolling up predictions every {prediction_rollups.settings['interval_seconds']}s")
+        prediction_rollups._loop()
+    else:
+        prediction_rollups.run_once()
@@ -0,0 +1,133 @@
+"""
+Precomputed prediction grid over the discrete input space
+(category x platform-or-auto x budget on a fixed step), so a prediction is an array lookup
+"""
+import bisect
+import time
+import numpy as np
+from typing import Dict, Optional
+
+from prediction_engine import score_batch, price_range_for, PRICE_RANGE_BOUNDS
+
+AUTO_PLATFORM = 0  # Platform axis index meaning "let the model choose"
+
+
+class PredictionTable:
+    """Dense grid of score_batch() outputs indexed by [category, platform, budget step]"""
+
+    def __init__(self, models: Dict, budget_step: float = 100, budget_max: float = 200000,
+                 interpolate: bool = True):
+        self.budget_step = float(budget_step)
+        self.budget_max = float(budget_max)
+        self.interpolate = interpolate
+        self.model_version = None  # Set by the owner to the model version it was built from
+
+        encoders = models['label_encoders']
+        self.categories = list(encoders['category'].classes_)
+        self.platforms = list(encoders['platform'].classes_)
+        self._category_idx = {c: i for i, c in enumerate(self.categories)}
+        # Axis 1: 0 = auto, then one slot per known platform
+        self._platform_idx = {p: i + 1 for i, p in enumerate(self.platforms)}
+
+        self.budgets = np.arange(0, self.budget_max + self.budget_step, self.budget_step)
+        self._price_ranges = price_range_for(self.budgets)
+
+        start = time.time()
+        self._build(models)
+        self.build_seconds = time.time() - start
+
+    def _build(self, models: Dict):
+        n_cat, n_plat, n_budget = len(self.categories), len(self.platforms) + 1, len(self.budgets)
+        shape = (n_cat, n_plat, n_budget)
+
+        cat_axis, plat_axis, budget_axis = np.meshgrid(
+            np.arange(n_cat), np.arange(n_plat), np.arange(n_budget), indexing='ij'
+        )
+        categories = [self.categories[i] for i in cat_axis.ravel()]
+        platforms = [None if i == AUTO_PLATFORM else self.platforms[i - 1] for i in plat_axis.ravel()]
+        budgets = self.budgets[budget_axis.ravel()]
+
+        scored = score_batch(models, categories, budgets, platforms)
+
+        platform_lookup = {p: i for i, p in enumerate(self.platforms)}
+        self.platform = np.array(
+            [platform_lookup[r['best_platform']] for r in scored], dtype=np.int16
+        ).reshape(shape)
+        self.confidence = np.array([r['platform_confidence'] for r in scored], dtype=np.float64).reshape(shape)
+        self.discount = np.array([r['predicted_discount'] for r in scored], dtype=np.float64).reshape(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return self.platform.nbytes + self.confidence.nbytes + self.discount.nbytes
+
+    def lookup(self, category: str, budget: float, platform: Optional[str] = None) -> Optional[Dict]:
+        """Return a score_batch()-shaped result, or None when the input is off the grid"""
+        c = self._category_idx.get(category)
+        if c is None or budget < 0 or budget > self.budget_max:
+            return None
+        if platform:
+            p = self._platform_idx.get(platform)
+            if p is None:
+                return None
+        else:
+            p = AUTO_PLATFORM
+
+        position = budget / self.budget_step
+        lo = int(position)
+        hi = min(lo + 1, len(self.budgets) - 1)
+        frac = position - lo
+
+        nearest = hi if frac >= 0.5 else lo
+        budget_range = bisect.bisect_right(PRICE_RANGE_BOUNDS, budget)
+        best = int(self.platform[c, p, nearest])
+        confidence = float(self.confidence[c, p, nearest])
+        discount = float(self.discount[c, p, nearest])
+
+        # Interpolate only where the neighbours share a price range and a platform,
+        # otherwise the blend would mix two different model regimes
+        if (self.interpolate and hi != lo and
+                self._price_ranges[lo] == budget_range == self._price_ranges[hi] and
+                self.platform[c, p, lo] == self.platform[c, p, hi]):
+            discount = float(self.discount[c, p, lo] * (1 - frac) + self.discount[c, p, hi] * frac)
+            confidence = float(self.confidence[c, p, lo] * (1 - frac) + self.confidence[c, p, hi] * frac)
+        elif self._price_ranges[nearest] != budget_range:
+            # Nearest grid point sits across a price-range boundary; use the in-range neighbour
+            in_range = lo if self._price_ranges[lo] == budget_range else hi
+            best = int(self.platform[c, p, in_range])
+            confidence = float(self.confidence[c, p, in_range])
+            discount = float(self.discount[c, p, in_range])
+
+        discounted_price = budget * (1 - discount / 100)
+        return {
+            'category': category,
+            'budget': float(budget),
+            'best_platform': platform if platform else self.platforms[best],
+            'platform_confidence': confidence,
+            'predicted_discount': discount,
+            'discounted_price': discounted_price,
+            'savings': budget - discounted_price
+        }
+
+    def verify(self, models: Dict, samples: int = 200, seed: int = 0) -> Dict:
+        """Compare table lookups against live scoring on random inputs"""
+        rng = np.random.default_rng(seed)
+        categories = list(rng.choice(self.categories, samples))
+        platform_choices = [None] + self.platforms
+        platforms = [platform_choices[i] for i in rng.integers(0, len(platform_choices), samples)]
+        budgets = np.round(rng.uniform(0, self.budget_max, samples), 2)
+
+        live = score_batch(models, categories, budgets, platforms)
+        discount_errors = []
+        platform_mismatches = 0
+        for category, budget, platform, expected in zip(categories, budgets, platforms, live):
+            got = self.lookup(category, float(budget), platform)
+            discount_errors.append(abs(got['predicted_discount'] - expected['predicted_discount']))
+            if got['best_platform'] != expected['best_platform']:
+                platform_mismatches += 1
+
+        return {
+            'samples': samples,
+            'max_discount_error': float(max(discount_errors)),
+            'mean_discount_error': float(np.mean(discount_errors)),
+            'platform_mismatch_rate': platform_mismatches / samples
+        }
@@ -0,0 +1,93 @@
+"""
+Compact product record used through the whole search path
+(parsing -> caches -> comparison -> relevance -> top-K -> JSON). A __slots__ object
+is several times smaller than the 12-key dict it replaces, attribute access is
+faster than key lookup, and mapping-style access (product['price'], product.get())
+keeps older callers working.
+"""
+from typing import Dict, Mapping
+
+FIELDS = ('platform', 'product_name', 'category', 'price', 'discounted_price', 'discount_percent',
+          'rating', 'stock', 'product_url', 'image_url', 'sku', 'savings')
+
+
+class ProductRecord:
+    """One product offer from one platform; treat as immutable once built (caches share them)"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, platform: str, product_name: str, category: str, price: float,
+                 discounted_price: float, discount_percent: float, rating: float, stock: int = 0,
+                 product_url: str = '', image_url: str = '', sku: str = '', savings: float = None):
+        self.platform = platform
+        self.product_name = product_name
+        self.category = category
+        self.price = price
+        self.discounted_price = discounted_price
+        self.discount_percent = discount_percent
+        self.rating = rating
+        self.stock = stock
+        self.product_url = product_url
+        self.image_url = image_url
+        self.sku = sku
+        self.savings = round(price - discounted_price, 2) if savings is None else savings
+
+    @classmethod
+    def from_mapping(cls, row: Mapping, show_images: bool = True) -> 'ProductRecord':
+        """Build from a dict such as a product_cache row (DECIMAL columns become floats)"""
+        return cls(
+            row['platform'],
+            row['product_name'],
+            row.get('category') or '',
+            float(row['price']),
+            float(row['discounted_price']),
+            float(row['discount_percent']),
+            float(row.get('rating') or 0),
+            int(row.get('stock') or 0),
+            row.get('product_url') or '',
+            (row.get('image_url') or '') if show_images else '',
+            row.get('sku') or '',
+            float(row['savings']) if row.get('savings') is not None else None
+        )
+
+    # Mapping-style access for code written against the old dicts
+    def __getitem__(self, key: str):
+        if key in FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in FIELDS else default
+
+    def __contains__(self, key) -> bool:
+        return key in FIELDS
+
+    def keys(self):
+        return FIELDS
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def to_json(self) -> Dict:
+        """Frontend shape used by /api/search - NO IMAGES"""
+        return {
+            'name': self.product_name,
+            'mrp': self.price,
+            'sale_price': self.discounted_price,
+            'discount': self.discount_percent,
+            'product_link': self.product_url or '#',
+            'platform': self.platform,
+            'rating': self.rating,
+            'savings': self.savings
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, ProductRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"ProductRecord({self.platform!r}, {self.product_name[:40]!r}, "
+                f"{self.discounted_price!r}, {self.discount_percent!r}%)")
@@ -0,0 +1,73 @@
+"""
+Columnar per-platform product statistics
+Shared by compare_products (merged API results) and the admin analytics endpoint
+(products table): one grouping pass with NumPy instead of re-filtering per platform.
+"""
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+STAT_PERCENTILES = (25, 50, 75, 90)
+
+
+def platform_stats_from_columns(platforms: Sequence, prices: Sequence, discounted_prices: Sequence,
+                                discounts: Sequence, percentiles: Iterable[int] = STAT_PERCENTILES) -> Dict:
+    """
+    Per-platform count, mean discount, lowest price, highest discount, mean price,
+    total savings and price/discount percentiles from parallel columns.
+    """
+    if len(platforms) == 0:
+        return {}
+    percentiles = list(percentiles)
+
+    # Platform codes in first-seen order (cheaper than np.unique's string sort)
+    names = list(dict.fromkeys(platforms))
+    codes = {name: i for i, name in enumerate(names)}
+    group = np.fromiter(map(codes.__getitem__, platforms), dtype=np.intp, count=len(platforms))
+    mrp = np.asarray(prices, dtype=float)
+    price = np.asarray(discounted_prices, dtype=float)
+    discount = np.asarray(discounts, dtype=float)
+    n = len(names)
+
+    counts = np.bincount(group, minlength=n)
+    discount_sum = np.bincount(group, weights=discount, minlength=n)
+    price_sum = np.bincount(group, weights=price, minlength=n)
+    savings_sum = np.bincount(group, weights=mrp - price, minlength=n)
+    lowest_price = np.full(n, np.inf)
+    np.minimum.at(lowest_price, group, price)
+    highest_discount = np.full(n, -np.inf)
+    np.maximum.at(highest_discount, group, discount)
+
+    # Group rows contiguously once; percentiles then work on slices
+    order = np.argsort(group, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    price_by_group = price[order]
+    discount_by_group = discount[order]
+
+    stats = {}
+    for i, platform in enumerate(names):
+        start, end = bounds[i], bounds[i + 1]
+        price_pct = np.percentile(price_by_group[start:end], percentiles) if percentiles else []
+        discount_pct = np.percentile(discount_by_group[start:end], percentiles) if percentiles else []
+        stats[str(platform)] = {
+            'product_count': int(counts[i]),
+            'avg_discount': float(discount_sum[i] / counts[i]),
+            'lowest_price': float(lowest_price[i]),
+            'highest_discount': float(highest_discount[i]),
+            'avg_price': float(price_sum[i] / counts[i]),
+            'total_savings': float(savings_sum[i]),
+            'price_percentiles': {f'p{p}': round(float(v), 2) for p, v in zip(percentiles, price_pct)},
+            'discount_percentiles': {f'p{p}': round(float(v), 2) for p, v in zip(percentiles, discount_pct)}
+        }
+    return stats
+
+
+def platform_stats(products: Sequence[Dict], percentiles: Iterable[int] = STAT_PERCENTILES) -> Dict:
+    """platform_stats_from_columns for a list of comparison product dicts"""
+    return platform_stats_from_columns(
+        [p['platform'] for p in products],
+        [p['price'] for p in products],
+        [p['discounted_price'] for p in products],
+        [p['discount_percent'] for p in products],
+        percentiles
+    )
@@ -0,0 +1,157 @@
+"""
+Token-bucket rate limiting for the platform APIs, shared by every request in the process
+With backend='file' the buckets live in small lock-protected files so all gunicorn
+workers on the host draw from the same budget.
+"""
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+from config import RATE_LIMIT_SETTINGS
+from metrics import register_collector
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, fall back to per-process buckets
+    fcntl = None
+
+_STATE_FORMAT = 'dd'  # tokens, updated_at (wall clock, comparable across processes)
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+def _reserve(tokens: float, rate: float, max_wait: float):
+    """
+    Try to take one token from an already refilled bucket.
+    Returns (new_tokens, wait_seconds) or (tokens, None) when the caller should be shed.
+    """
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    wait = (1 - tokens) / rate
+    if wait > max_wait:
+        return tokens, None
+    # Reserve the next token now; the caller sleeps until it is due
+    return tokens - 1, wait
+
+
+class PlatformRateLimiter:
+    """Per-platform token buckets that queue callers briefly or shed them"""
+
+    def __init__(self, settings: Dict):
+        self.default_rate = settings['rate']
+        self.default_burst = settings['burst']
+        self.max_wait = settings['max_wait']
+        self.backoff_seconds = settings['backoff_seconds']
+        self.overrides = dict(settings.get('platforms', {}))
+        self.backend = settings.get('backend', 'memory')
+        self.state_dir = settings.get('state_dir')
+
+        if self.backend == 'file' and fcntl is None:
+            print("⚠️ File rate-limit backend needs fcntl; using in-process buckets")
+            self.backend = 'memory'
+        if self.backend == 'file':
+            os.makedirs(self.state_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._stats = {}
+
+    def _limits(self, platform: str):
+        override = self.overrides.get(platform, {})
+        return override.get('rate', self.default_rate), override.get('burst', self.default_burst)
+
+    def set_default_policy(self, platform: str, limits: Dict):
+        """Limits a platform adapter ships with; explicit RATE_LIMIT_SETTINGS entries take precedence"""
+        self.overrides.setdefault(platform, dict(limits))
+
+    def acquire(self, platform: str, max_wait: Optional[float] = None) -> bool:
+        """Take a token for platform, waiting up to max_wait seconds; False means shed the call"""
+        wait = self.reserve(platform, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def reserve(self, platform: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token without sleeping: seconds until it is due, or None to shed (for async callers)"""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        rate, _ = self._limits(platform)
+
+        wait = self._update(platform, lambda tokens: _reserve(tokens, rate, max_wait))
+
+        with self._lock:
+            stats = self._stats.setdefault(platform, self._new_stats())
+            if wait is None:
+                stats['rejected_total'] += 1
+                return None
+            stats['acquired_total'] += 1
+            stats['wait_seconds_total'] += wait
+            stats['wait_seconds_max'] = max(stats['wait_seconds_max'], wait)
+        return wait
+
+    def backoff(self, platform: str, seconds: Optional[float] = None):
+        """Drain the bucket so no call to platform is made for `seconds` (e.g. after a 429)"""
+        seconds = self.backoff_seconds if seconds is None else seconds
+        rate, _ = self._limits(platform)
+        # Next token becomes available exactly `seconds` from now
+        self._update(platform, lambda tokens: (min(tokens, 1 - seconds * rate), None))
+        with self._lock:
+            self._stats.setdefault(platform, self._new_stats())['backoffs_total'] += 1
+
+    def _update(self, platform: str, fn):
+        """Refill the bucket, apply fn(tokens) -> (new_tokens, result) atomically, return result"""
+        if self.backend == 'file':
+            return self._update_file(platform, fn)
+
+        rate, burst = self._limits(platform)
+        with self._lock:
+            now = time.time()
+            tokens, updated = self._buckets.get(platform, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            new_tokens, result = fn(tokens)
+            self._buckets[platform] = (new_tokens, now)
+            return result
+
+    def _update_file(self, platform: str, fn):
+        path = os.path.join(self.state_dir, f'{platform.lower()}.bucket')
+        rate, burst = self._limits(platform)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, _STATE_SIZE, 0)
+            now = time.time()
+            if len(raw) == _STATE_SIZE:
+                tokens, updated = struct.unpack(_STATE_FORMAT, raw)
+            else:
+                tokens, updated = burst, now
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            new_tokens, result = fn(tokens)
+            os.pwrite(fd, struct.pack(_STATE_FORMAT, new_tokens, now), 0)
+            return result
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @staticmethod
+    def _new_stats():
+        return {
+            'acquired_total': 0,
+            'rejected_total': 0,
+            'backoffs_total': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0
+        }
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            values = {}
+            for platform, stats in self._stats.items():
+                for key, value in stats.items():
+                    values[f'{platform.lower()}_{key}'] = round(value, 6) if isinstance(value, float) else value
+            return values
+
+
+platform_rate_limiter = PlatformRateLimiter(RATE_LIMIT_SETTINGS)
+register_collector('rate_limit', platform_rate_limiter.metrics)
@@ -0,0 +1,108 @@
+"""
+Relevance scoring for multi-platform search results
+Same rule as the original difflib filter: a query token matches a field when it is
+contained in the field's text or difflib's ratio against that text is at least 0.72.
+Products are indexed by distinct field text, so each (token, text) pair is checked
+once per result set, and difflib's cheap upper bounds skip texts too long to ever
+reach the ratio before the full comparison runs.
+"""
+import difflib
+import math
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+STOPWORDS = frozenset({
+    'laptop', 'laptops', 'notebook', 'pc', 'computer', 'computers',
+    'mobile', 'phone', 'device', 'watch', 'watches', 'shoe', 'shoes',
+    'headphone', 'headphones', 'earphone', 'earphones'
+})
+
+# Per field: points for a query token matching it (a token scores on its best field only)
+FIELD_WEIGHTS = (('product_name', 2), ('platform', 1), ('category', 1))
+MIN_MATCH_FRACTION = 0.4
+FUZZY_RATIO = 0.72
+
+
+def query_tokens(query: str) -> List[str]:
+    """Significant query tokens: whitespace-split, at least 2 characters and not a generic category word"""
+    return [t for t in (query or '').lower().split() if len(t) >= 2 and t not in STOPWORDS]
+
+
+@lru_cache(maxsize=200000)
+def text_matches(token: str, text: str) -> bool:
+    """Query token matches a lower-cased field text: contained in it, or difflib ratio >= FUZZY_RATIO"""
+    if not text:
+        return False
+    if token in text:
+        return True
+    # real_quick_ratio/quick_ratio are upper bounds of ratio(), so failing either settles it
+    matcher = difflib.SequenceMatcher(None, token, text)
+    return (matcher.real_quick_ratio() >= FUZZY_RATIO and matcher.quick_ratio() >= FUZZY_RATIO
+            and matcher.ratio() >= FUZZY_RATIO)
+
+
+class RelevanceIndex:
+    """Products grouped by distinct lower-cased field text, one map per scored field"""
+
+    def __init__(self, products: Sequence[Dict]):
+        self.products = products
+        self.postings = {}
+        for field, _ in FIELD_WEIGHTS:
+            index: Dict[str, List[int]] = {}
+            for position, product in enumerate(products):
+                index.setdefault((product.get(field) or '').lower(), []).append(position)
+            self.postings[field] = index
+
+    def _matching_positions(self, field: str, token: str) -> set:
+        positions = set()
+        for text, posting in self.postings[field].items():
+            if text_matches(token, text):
+                positions.update(posting)
+        return positions
+
+    def scores(self, tokens: Sequence[str]) -> List[int]:
+        """Score per product (same order as products)"""
+        scores = [0] * len(self.products)
+        for token in tokens:
+            best = {}
+            for field, weight in FIELD_WEIGHTS:
+                for position in self._matching_positions(field, token):
+                    if best.get(position, 0) < weight:
+                        best[position] = weight
+            for position, weight in best.items():
+                scores[position] += weight
+        return scores
+
+
+def rank(products: Sequence[Dict], query: str) -> List[Tuple[Dict, int]]:
+    """(product, score) pairs, highest score first (ties keep input order)"""
+    tokens = query_tokens(query)
+    if not tokens or not products:
+        return [(p, 0) for p in products]
+    scores = RelevanceIndex(products).scores(tokens)
+    order = sorted(range(len(products)), key=lambda i: -scores[i])
+    return [(products[i], scores[i]) for i in order]
+
+
+def filter_relevant(products: List[Dict], query: str) -> List[Dict]:
+    """
+    Keep products matching at least 40% of the query tokens; if none do, keep any
+    product with a match; if still none, return products unchanged. Input order is kept.
+    """
+    tokens = query_tokens(query)
+    if not tokens or not products:
+        return products
+
+    scores = RelevanceIndex(products).scores(tokens)
+    min_required = max(1, math.ceil(len(tokens) * MIN_MATCH_FRACTION))
+
+    filtered = [p for p, s in zip(products, scores) if s >= min_required]
+    if filtered:
+        print(f"🔎 Filtered to {len(filtered)}/{len(products)} relevant products")
+        return filtered
+
+    softer = [p for p, s in zip(products, scores) if s >= 1]
+    if softer:
+        print(f"🔎 Using softer match: {len(softer)} products")
+        return softer
+    return products
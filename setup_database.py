@@ -1,58 +1,17 @@
 import mysql.connector
-from app import DB_CONFIG
+from config import DB_CONFIG
+from migrations import migrate
 
 def setup_database():
     try:
         # Connect to MySQL
         conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        # Create users table if not exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255) NOT NULL UNIQUE,
-                password VARCHAR(255) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
         
-        # Create products table if not exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS products (
-                product_id INT AUTO_INCREMENT PRIMARY KEY,
-                platform VARCHAR(50) NOT NULL,
-                sku VARCHAR(20) NOT NULL,
-                product_name VARCHAR(255) NOT NULL,
-                category VARCHAR(100) NOT NULL,
-                price DECIMAL(10, 2) NOT NULL,
-                discount_percent DECIMAL(5, 2) DEFAULT 0,
-                discounted_price DECIMAL(10, 2),
-                rating DECIMAL(3, 2) DEFAULT 4.0,
-                stock INT DEFAULT 100,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        # Tables and indexes are versioned in migrations.py
+        applied = migrate(conn)
+        print(f"✅ Database tables created successfully! (migrations applied: {applied or 'none'})")
         
-        # Create predictions table if not exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS predictions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_email VARCHAR(255) NOT NULL,
-                category VARCHAR(100) NOT NULL,
-                budget DECIMAL(10, 2) NOT NULL,
-                platform VARCHAR(50),
-                predicted_discount DECIMAL(5, 2) NOT NULL,
-                predicted_platform VARCHAR(50) NOT NULL,
-                discounted_price DECIMAL(10, 2) NOT NULL,
-                savings DECIMAL(10, 2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        print("✅ Database tables created successfully!")
+        cursor = conn.cursor()
         
         # Verify tables
         cursor.execute("SHOW TABLES")
@@ -1,5 +1,5 @@
 import mysql.connector
-from app import DB_CONFIG
+from config import DB_CONFIG
 from werkzeug.security import generate_password_hash
 
 
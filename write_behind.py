@@ -0,0 +1,164 @@
+"""
+Background write-behind queue for append-only inserts (prediction logging)
+Rows are buffered in a bounded in-memory queue and flushed with executemany
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Sequence
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Buffers rows and flushes them in batches on size or time thresholds"""
+
+    def __init__(self, name: str, sql: str, connection_factory: Callable, batch_size: int = 200,
+                 flush_interval: float = 1.0, max_queue: int = 10000, put_timeout: float = 0.05):
+        self.name = name
+        self.sql = sql
+        self.connection_factory = connection_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._flushes = 0
+        self._flush_failures = 0
+        self._flush_seconds_total = 0.0
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+
+        atexit.register(self.close)
+
+    def put(self, row: Sequence) -> bool:
+        """Enqueue one row; waits at most put_timeout when full, then drops it"""
+        self._ensure_worker()
+        try:
+            self._queue.put(tuple(row), timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+                dropped = self._dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                print(f"⚠️ {self.name}: queue full, {dropped} rows dropped so far")
+            return False
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def put_many(self, rows: Iterable[Sequence]) -> int:
+        """Enqueue several rows, returning how many were accepted"""
+        return sum(1 for row in rows if self.put(row))
+
+    def _ensure_worker(self):
+        # Start lazily (and again after fork) so each gunicorn worker owns its flusher
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is None or self._pid != pid:
+                if self._pid is not None and self._pid != pid:
+                    self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                self._closed = False
+                self._pid = pid
+                self._thread = threading.Thread(target=self._run, name=f'{self.name}-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = []
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if stopping:
+                # Drain everything still buffered before exiting
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+                for start in range(0, len(batch), self.batch_size):
+                    self._flush(batch[start:start + self.batch_size])
+                return
+
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        start = time.perf_counter()
+        try:
+            conn = self.connection_factory()
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(self.sql, batch)
+                conn.commit()
+                cursor.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            with self._lock:
+                self._flush_failures += 1
+                self._dropped += len(batch)
+            print(f"⚠️ {self.name}: failed to write {len(batch)} rows: {e}")
+            return
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._flushes += 1
+            self._written += len(batch)
+            self._flush_seconds_total += elapsed
+            self._last_flush_seconds = elapsed
+            self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+
+    def close(self, timeout: float = 10.0):
+        """Flush buffered rows and stop the writer thread (registered with atexit)"""
+        thread = self._thread
+        if self._closed or thread is None or self._pid != os.getpid():
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        self._thread = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                'depth': self._queue.qsize(),
+                'capacity': self._queue.maxsize,
+                'enqueued_total': self._enqueued,
+                'written_total': self._written,
+                'dropped_total': self._dropped,
+                'flushes_total': self._flushes,
+                'flush_failures_total': self._flush_failures,
+                'flush_seconds_total': round(self._flush_seconds_total, 6),
+                'flush_seconds_last': round(self._last_flush_seconds, 6),
+                'flush_seconds_max': round(self._max_flush_seconds, 6)
+            }